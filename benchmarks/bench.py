@@ -0,0 +1,298 @@
+"""
+Benchmarks of the Solscan client against the local mock server.
+
+Every run of a scenario starts a fresh benchmarks.mock_server in a child process, so its
+CPU time is not counted and its seeded latency and 429 draws repeat, and a fresh Client
+whose requests are redirected to it. Scenarios:
+
+    get: tx_detail of `calls` distinct signatures, `concurrency` at a time
+    massive_get: massive_account_transfers of `total` transfers, 100 per page
+    massive_get_sharded: the same crawl split into block time shards of `shard_pages` pages
+    massive_account_transactions: `before` cursor walk of `total` transactions, 40 per page
+    massive_account_transactions_parallel: the same walk from `parallelism` cursors, at least 2
+
+Each scenario runs `repeat` times and reports medians of the wall time, requests and
+items per second, exact p50/p95/p99 of request latency and of call duration (limiter
+waits and retries included), retries and 429s, and CPU seconds per request. Peak memory
+per request is measured with tracemalloc in one extra run, which would slow down the
+timed ones. Results are written as JSON with the arguments, the Python version and the
+git commit, and --compare prints the change against an earlier result file.
+
+Example:
+    python -m benchmarks.bench --output benchmarks/results/baseline.json
+    python -m benchmarks.bench --scenario massive_get --latency 0.05 --throttle 0.02 --compare benchmarks/results/baseline.json
+
+Classes:
+    LocalTransport: Sends requests for the Solscan API to the mock server
+    LatencyRecorder: Hooks keeping every request latency and call duration
+"""
+
+
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+from loguru import logger
+
+from py3s import Client, Hooks, HttpxTransport, RequestTrace
+from py3s.client import LargePageSize, SmallPageSize, pro_base_url, public_base_url
+
+from .mock_server import MockConfig, MockSolscan
+
+
+# The client asks for a password unless given one, so the benchmark token is encrypted
+_password = "00" * 32
+_address = "Bench11111111111111111111111111111111111111"
+
+
+def _encrypted_token(token: str) -> str:
+    iv = os.urandom(AES.block_size)
+    cipher = AES.new(bytes.fromhex(_password), AES.MODE_CBC, iv)
+    return base64.b64encode(iv + cipher.encrypt(pad(token.encode(), AES.block_size))).decode()
+
+
+class LocalTransport(HttpxTransport):
+    """HttpxTransport sending requests for the Solscan API to the mock server at `url`."""
+
+    def __init__(self, url: str, **kwargs):
+        super().__init__(http2=False, **kwargs)
+        self._bases = {pro_base_url: f"{url}/v2.0", public_base_url: f"{url}/public"}
+
+    async def get(self, url: str, headers: dict[str, str]):
+        for base, local in self._bases.items():
+            if url.startswith(base):
+                url = local + url[len(base):]
+                break
+        return await super().get(url, headers)
+
+
+class LatencyRecorder(Hooks):
+    """Keeps the latency of every request and the duration of every call."""
+
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.durations: list[float] = []
+
+    def attempted(self, trace: RequestTrace, status: int | None, latency: float, size: int, wait: float, error: BaseException | None):
+        self.latencies.append(latency)
+
+    def finished(self, trace: RequestTrace):
+        self.durations.append(trace.duration)
+
+
+def _quantiles(values: list[float]) -> tuple[float, float, float] | tuple[None, None, None]:
+    if len(values) < 2:
+        return (values[0],) * 3 if values else (None, None, None)
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+async def _get(client: Client, args: argparse.Namespace) -> int:
+    results, _ = await client.tx_detail_many((f"sig{i}" for i in range(args.calls)), concurrency=args.concurrency)
+    return len(results)
+
+
+async def _massive_get(client: Client, args: argparse.Namespace) -> int:
+    return len(await client.massive_account_transfers(_address, total_size=args.total, page_size=LargePageSize.PAGE_SIZE_100))
+
+
+async def _massive_get_sharded(client: Client, args: argparse.Namespace) -> int:
+    return len(await client.massive_account_transfers(_address, total_size=args.total, page_size=LargePageSize.PAGE_SIZE_100,
+                                                      shard_pages=args.shard_pages))
+
+
+async def _massive_account_transactions(client: Client, args: argparse.Namespace) -> int:
+    return len(await client.massive_account_transactions(_address, total_size=args.total, limit=SmallPageSize.PAGE_SIZE_40))
+
+
+async def _massive_account_transactions_parallel(client: Client, args: argparse.Namespace) -> int:
+    return len(await client.massive_account_transactions(_address, total_size=args.total, limit=SmallPageSize.PAGE_SIZE_40,
+                                                         parallelism=max(2, args.parallelism)))
+
+
+scenarios: dict[str, Callable[[Client, argparse.Namespace], Awaitable[int]]] = {
+    "get": _get,
+    "massive_get": _massive_get,
+    "massive_get_sharded": _massive_get_sharded,
+    "massive_account_transactions": _massive_account_transactions,
+    "massive_account_transactions_parallel": _massive_account_transactions_parallel,
+}
+
+
+def _serve(config: MockConfig, ready: multiprocessing.Queue):
+    async def main():
+        server = MockSolscan(config)
+        await server.start()
+        ready.put(server.port)
+        await asyncio.Event().wait()
+    asyncio.run(main())
+
+
+class _Server:
+    """Mock server in a child process, for one run."""
+
+    def __init__(self, config: MockConfig):
+        self._config = config
+        self._process: multiprocessing.Process = None
+        self.url: str = None
+
+    def __enter__(self) -> "_Server":
+        ready = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_serve, args=(self._config, ready), daemon=True)
+        self._process.start()
+        self.url = f"http://127.0.0.1:{ready.get(timeout=30)}"
+        return self
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join()
+
+
+async def _run(name: str, url: str, args: argparse.Namespace, trace_memory: bool) -> dict[str, Any]:
+    recorder = LatencyRecorder()
+    client = Client(auth_token=_encrypted_token("bench"), aes_256_hex_password=_password, transport=LocalTransport(url, pool_size=args.pool_size),
+                    max_requests_per_minute=args.max_requests_per_minute, max_in_flight=args.concurrency, hooks=[recorder])
+    async with client:
+        if trace_memory:
+            tracemalloc.start()
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        items = await scenarios[name](client, args)
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        endpoints = client.metrics()["endpoints"]
+    requests = sum(e["attempts"] for e in endpoints)
+    if trace_memory:
+        return {"peak_memory_bytes": peak, "memory_bytes_per_request": peak / max(requests, 1)}
+    latency = _quantiles(recorder.latencies)
+    duration = _quantiles(recorder.durations)
+    return {
+        "wall_seconds": wall,
+        "items": items,
+        "requests": requests,
+        "requests_per_second": requests / wall,
+        "items_per_second": items / wall,
+        "latency_p50": latency[0],
+        "latency_p95": latency[1],
+        "latency_p99": latency[2],
+        "call_p50": duration[0],
+        "call_p95": duration[1],
+        "call_p99": duration[2],
+        "retries": sum(e["retries"] for e in endpoints),
+        "throttled": sum(e["throttled"] for e in endpoints),
+        "bytes": sum(e["bytes"] for e in endpoints),
+        "cpu_seconds": cpu,
+        "cpu_ms_per_request": cpu * 1000 / max(requests, 1),
+    }
+
+
+def run_scenario(name: str, config: MockConfig, args: argparse.Namespace) -> dict[str, Any]:
+    """Runs scenario `name` `args.repeat` times, plus once with memory tracing, and returns the medians."""
+    runs = []
+    for _ in range(args.repeat):
+        with _Server(config) as server:
+            runs.append(asyncio.run(_run(name, server.url, args, False)))
+    result = {key: statistics.median(run[key] for run in runs) if runs[0][key] is not None else None for key in runs[0]}
+    if not args.no_memory:
+        with _Server(config) as server:
+            result.update(asyncio.run(_run(name, server.url, args, True)))
+    return result
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]):
+    """Prints every metric of `current` next to `baseline`, with the relative change."""
+    for name, metrics in current["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if old is None:
+            continue
+        print(f"{name}:")
+        for key, value in metrics.items():
+            before = old.get(key)
+            if not isinstance(value, (int, float)) or not isinstance(before, (int, float)):
+                continue
+            change = f"{(value - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"  {key:28} {before:14.6g} {value:14.6g} {change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of the Solscan client against a local mock server")
+    parser.add_argument("--scenario", action="append", choices=list(scenarios), help="scenario to run, may be repeated, defaults to all")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per scenario, the median is reported")
+    parser.add_argument("--calls", type=int, default=2000, help="tx_detail calls of the get scenario")
+    parser.add_argument("--total", type=int, default=10_000, help="items crawled by the massive scenarios, and held by the mock")
+    parser.add_argument("--concurrency", type=int, default=32, help="max_in_flight of the client, and concurrency of the get scenario")
+    parser.add_argument("--parallelism", type=int, default=4, help="cursors walked by massive_account_transactions_parallel, 1 by massive_account_transactions")
+    parser.add_argument("--shard-pages", type=int, default=10, help="pages per block time shard of massive_get_sharded")
+    parser.add_argument("--pool-size", type=int, default=100, help="connections of the transport")
+    parser.add_argument("--max-requests-per-minute", type=int, default=1_000_000, help="client rate limit, high to measure the client itself")
+    parser.add_argument("--latency", type=float, default=0.02, help="mean latency of the mock server in seconds")
+    parser.add_argument("--jitter", type=float, default=0.5, help="relative latency spread of the mock server")
+    parser.add_argument("--padding", type=int, default=0, help="extra bytes per item returned by the mock server")
+    parser.add_argument("--throttle", type=float, default=0.0, help="share of requests the mock server answers with 429")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After of 429 responses")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the memory run")
+    parser.add_argument("--output", help="result file, defaults to benchmarks/results/<time>.json")
+    parser.add_argument("--compare", help="earlier result file to compare with")
+    args = parser.parse_args()
+    # per-page info lines of massive crawls would be part of what is measured
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    config = MockConfig(latency=args.latency, jitter=args.jitter, total=args.total, padding=args.padding,
+                        throttle=args.throttle, retry_after=args.retry_after, seed=args.seed)
+    started = datetime.now(timezone.utc)
+    results = {}
+    for name in args.scenario or list(scenarios):
+        print(f"Running {name} ...", file=sys.stderr, flush=True)
+        results[name] = run_scenario(name, config, args)
+    report = {
+        "meta": {
+            "started": started.isoformat(),
+            "commit": _commit(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+            "server": config.to_dict(),
+        },
+        "scenarios": results,
+    }
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", f"{started:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
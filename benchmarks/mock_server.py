@@ -0,0 +1,265 @@
+"""
+Local mock of the Solscan API for benchmarks.
+
+Serves the endpoints the benchmarks crawl, over HTTP/1.1 with keep-alive, from an asyncio
+server with no dependencies. Every account and token has `total` items whose block times
+count down by one second from a fixed start, so results are identical between runs.
+Latency, payload size and 429 responses are configurable, and drawn from a seeded random
+generator for reproducibility.
+
+Pro endpoints are served under /v2.0 and public ones under /public. Client requests are
+redirected there by benchmarks.bench.LocalTransport.
+
+Endpoints:
+    /v2.0/account/transfer: page/page_size pagination, block_time[] filter
+    /v2.0/account/balance_change: page/page_size pagination, block_time[] filter
+    /v2.0/account/defi/activities: page/page_size pagination, block_time[] filter
+    /v2.0/account/transactions: before/limit cursor
+    /v2.0/token/holders: page/page_size pagination, with the total
+    /v2.0/token/meta, /v2.0/account/detail, /v2.0/transaction/detail: single items
+    /public/chaininfo: chain info
+
+Example:
+    python -m benchmarks.mock_server --port 8899 --latency 0.05 --throttle 0.01
+
+Classes:
+    MockConfig: Behaviour of the mock server
+    MockSolscan: The server
+"""
+
+
+import argparse
+import asyncio
+import json
+import random
+from urllib.parse import parse_qs, urlsplit
+
+
+# Block time of the newest item of every account
+start_block_time = 1_700_000_000
+
+
+class MockConfig:
+    """Behaviour of the mock server.
+
+    Args:
+        latency (float, optional): Mean seconds before a response is sent. Defaults to 0.02.
+        jitter (float, optional): Latency is drawn uniformly from latency * (1 ± jitter). Defaults to 0.5.
+        total (int, optional): Items of every account and token. Defaults to 10000.
+        padding (int, optional): Extra bytes added to every item, to vary the payload size. Defaults to 0.
+        throttle (float, optional): Share of requests answered with 429. Defaults to 0.
+        retry_after (float, optional): Retry-After of 429 responses, in seconds. Defaults to 0.1.
+        seed (int, optional): Seed of latency and throttling draws. Defaults to 0.
+    """
+
+    def __init__(self, *, latency: float = 0.02, jitter: float = 0.5, total: int = 10_000, padding: int = 0,
+                 throttle: float = 0.0, retry_after: float = 0.1, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.total = total
+        self.padding = padding
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.seed = seed
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+
+def _block_time_range(query: dict[str, list[str]]) -> tuple[int, int] | None:
+    bounds = query.get("block_time[]")
+    if not bounds or len(bounds) != 2:
+        return None
+    return int(bounds[0]), int(bounds[1])
+
+
+class MockSolscan:
+    """Mock Solscan API server.
+
+    Args:
+        config (MockConfig): Behaviour of the server.
+        host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+        port (int, optional): Port to listen on, 0 for any free one. Defaults to 0.
+
+    Attributes:
+        requests (int): Requests answered
+        throttled (int): Requests answered with 429
+        bytes (int): Response body bytes sent
+    """
+
+    def __init__(self, config: MockConfig, *, host: str = "127.0.0.1", port: int = 0):
+        self.config = config
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.throttled = 0
+        self.bytes = 0
+        self._random = random.Random(config.seed)
+        self._server: asyncio.Server = None
+        self._pad = "x" * config.padding
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                target = head.split(b" ", 2)[1].decode()
+                status, body, headers = await self._respond(target)
+                head = [f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}", "Content-Type: application/json",
+                        f"Content-Length: {len(body)}", *headers, "", ""]
+                writer.write("\r\n".join(head).encode() + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, target: str) -> tuple[int, bytes, list[str]]:
+        config = self.config
+        await asyncio.sleep(max(0.0, config.latency * (1 + config.jitter * (2 * self._random.random() - 1))))
+        self.requests += 1
+        if config.throttle and self._random.random() < config.throttle:
+            self.throttled += 1
+            return 429, b'{"success":false,"errors":{"code":429,"message":"Too many requests"}}', [f"Retry-After: {config.retry_after}"]
+        parts = urlsplit(target)
+        query = parse_qs(parts.query)
+        handler = self._routes.get(parts.path)
+        if handler is None:
+            return 404, b'{"success":false,"errors":{"code":404,"message":"Not found"}}', []
+        body = json.dumps({"success": True, "data": handler(self, query)}, separators=(",", ":")).encode()
+        self.bytes += len(body)
+        return 200, body, []
+
+    def _page(self, query: dict[str, list[str]], item) -> list:
+        page = int(query.get("page", ["1"])[0])
+        page_size = int(query.get("page_size", ["10"])[0])
+        # items are numbered newest first, item i happened i seconds before the newest
+        first, last = 0, self.config.total
+        bounds = _block_time_range(query)
+        if bounds is not None:
+            first = max(first, start_block_time - bounds[1])
+            last = min(last, start_block_time - bounds[0] + 1)
+        start = first + (page - 1) * page_size
+        return [item(i) for i in range(start, min(start + page_size, last))]
+
+    def _transfer(self, i: int) -> dict:
+        return {"block_id": 300_000_000 - i, "trans_id": f"tx{i}", "block_time": start_block_time - i, "time": "2023-11-14T22:13:20.000Z",
+                "activity_type": "ACTIVITY_SPL_TRANSFER", "from_address": "From1111111111111111111111111111111111111111",
+                "to_address": "To11111111111111111111111111111111111111111", "token_address": "So11111111111111111111111111111111111111112",
+                "token_decimals": 9, "amount": 1_000_000 + i, "flow": "out", "_pad": self._pad}
+
+    def _balance_change(self, i: int) -> dict:
+        return {"block_id": 300_000_000 - i, "block_time": start_block_time - i, "time": "2023-11-14T22:13:20.000Z", "trans_id": f"tx{i}",
+                "address": "Acct111111111111111111111111111111111111111", "token_address": "So11111111111111111111111111111111111111112",
+                "token_account": "TokAcct11111111111111111111111111111111111", "token_decimals": 9, "amount": 1_000 + i,
+                "pre_balance": 10_000_000, "post_balance": 10_001_000 + i, "change_type": "inc", "fee": 5000, "_pad": self._pad}
+
+    def _defi_activity(self, i: int) -> dict:
+        return {"block_id": 300_000_000 - i, "trans_id": f"tx{i}", "block_time": start_block_time - i, "time": "2023-11-14T22:13:20.000Z",
+                "activity_type": "ACTIVITY_TOKEN_SWAP", "from_address": "From1111111111111111111111111111111111111111",
+                "to_address": "To11111111111111111111111111111111111111111", "sources": ["Prog111111111111111111111111111111111111111"],
+                "platform": "Prog111111111111111111111111111111111111111", "routers": {}, "_pad": self._pad}
+
+    def _transaction(self, i: int) -> dict:
+        return {"slot": 300_000_000 - i, "fee": 5000, "status": "Success", "signer": ["Signer11111111111111111111111111111111111111"],
+                "block_time": start_block_time - i, "tx_hash": f"tx{i}", "parsed_instructions": [{"type": "transfer", "program": "spl-token",
+                "program_id": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"}], "program_ids": ["TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"],
+                "time": "2023-11-14T22:13:20.000Z", "_pad": self._pad}
+
+    def _holder(self, i: int) -> dict:
+        return {"address": f"Holder{i:038d}", "amount": 10_000_000_000 - i, "decimals": 6, "owner": f"Owner{i:039d}", "rank": i + 1, "_pad": self._pad}
+
+    def _account_transfer(self, query: dict[str, list[str]]) -> list:
+        return self._page(query, self._transfer)
+
+    def _account_balance_change(self, query: dict[str, list[str]]) -> list:
+        return self._page(query, self._balance_change)
+
+    def _account_defi_activities(self, query: dict[str, list[str]]) -> list:
+        return self._page(query, self._defi_activity)
+
+    def _account_transactions(self, query: dict[str, list[str]]) -> list:
+        before = query.get("before", [None])[0]
+        limit = int(query.get("limit", ["10"])[0])
+        start = int(before[2:]) + 1 if before else 0
+        return [self._transaction(i) for i in range(start, min(start + limit, self.config.total))]
+
+    def _token_holders(self, query: dict[str, list[str]]) -> dict:
+        return {"total": self.config.total, "items": self._page(query, self._holder)}
+
+    def _token_meta(self, query: dict[str, list[str]]) -> dict:
+        address = query.get("address", [""])[0]
+        return {"supply": "1000000000000000", "address": address, "name": "Mock", "symbol": "MOCK", "icon": "", "decimals": 6,
+                "holder": self.config.total, "creator": "Creator111111111111111111111111111111111111", "create_tx": "tx0",
+                "created_time": start_block_time, "first_mint_tx": "tx0", "first_mint_time": start_block_time, "price": 1.0,
+                "volume_24h": 1000.0, "market_cap": 1_000_000.0, "market_cap_rank": 1, "price_change_24h": 0.0}
+
+    def _account_detail(self, query: dict[str, list[str]]) -> dict:
+        return {"account": query.get("address", [""])[0], "lamports": 1_000_000_000, "type": "system_account", "executable": False,
+                "owner_program": "11111111111111111111111111111111", "rent_epoch": 0, "is_oncurve": True}
+
+    def _transaction_detail(self, query: dict[str, list[str]]) -> dict:
+        tx = query.get("tx", [""])[0]
+        return {"block_id": 300_000_000, "fee": 5000, "reward": [], "sol_bal_change": [], "token_bal_change": [], "tokens_involved": [],
+                "parsed_instructions": [], "programs_involved": [], "signer": ["Signer11111111111111111111111111111111111111"], "status": 1,
+                "account_keys": [], "compute_units_consumed": 150, "confirmations": None, "version": "0", "tx_hash": tx,
+                "block_time": start_block_time, "log_message": ["Program log: " + self._pad], "recent_block_hash": "Hash1111",
+                "tx_status": "finalized"}
+
+    def _chaininfo(self, query: dict[str, list[str]]) -> dict:
+        return {"blockHeight": 280_000_000, "currentEpoch": 700, "absoluteSlot": 300_000_000, "transactionCount": 400_000_000_000}
+
+    _routes = {
+        "/v2.0/account/transfer": _account_transfer,
+        "/v2.0/account/balance_change": _account_balance_change,
+        "/v2.0/account/defi/activities": _account_defi_activities,
+        "/v2.0/account/transactions": _account_transactions,
+        "/v2.0/token/holders": _token_holders,
+        "/v2.0/token/meta": _token_meta,
+        "/v2.0/account/detail": _account_detail,
+        "/v2.0/transaction/detail": _transaction_detail,
+        "/public/chaininfo": _chaininfo,
+    }
+
+
+async def serve(config: MockConfig, host: str, port: int):
+    server = MockSolscan(config, host=host, port=port)
+    await server.start()
+    print(f"Mock Solscan API listening on {server.url}", flush=True)
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the Solscan API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--latency", type=float, default=0.02, help="mean response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.5, help="relative latency spread")
+    parser.add_argument("--total", type=int, default=10_000, help="items of every account and token")
+    parser.add_argument("--padding", type=int, default=0, help="extra bytes per item")
+    parser.add_argument("--throttle", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After of 429 responses")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    config = MockConfig(latency=args.latency, jitter=args.jitter, total=args.total, padding=args.padding,
+                        throttle=args.throttle, retry_after=args.retry_after, seed=args.seed)
+    try:
+        asyncio.run(serve(config, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,14 @@
-from .client import Client
\ No newline at end of file
+from .cache import Cache, CachePolicy, MemoryCache, SQLiteCache, TieredCache
+from .checkpoint import Checkpoint
+from .client import Client, endpoint_schemas
+from .columnar import BalanceChangeBatch, ColumnBatch, DefiActivityBatch, TransferBatch
+from .decoding import Decoder, JsonDecoder, MsgspecDecoder, OrjsonDecoder
+from .keypool import ApiKey, KeyPool
+from .metrics import Hooks, Metrics, RequestTrace, SpanHooks
+from .pipeline import DecodePool, normalize_amounts
+from .ratelimit import MemoryWindowStore, RedisWindowStore, SQLiteWindowStore, WindowStore
+from .retry import RetryPolicy
+from .scheduler import Priority, Scheduler
+from .tail import Cadence, FairSchedule, Poller, SeenSet
+from .transport import HttpxTransport, RequestsTransport, Transport
+from .watermark import MemoryWatermarkStore, SQLiteWatermarkStore, WatermarkStore
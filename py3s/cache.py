@@ -0,0 +1,357 @@
+"""
+Response caching for the Solscan client.
+
+Client.get looks responses up by their normalized URL before spending rate limit quota.
+A CachePolicy decides per endpoint how long a response may be reused: finalized
+transactions and blocks never change, token metadata and pool info change slowly, and
+everything else is not cached.
+
+Classes:
+    CachePolicy: Maps endpoint paths to TTLs
+    Cache: Base class for cache backends
+    MemoryCache: In-memory LRU cache bounded by entries and bytes, with TTLs and hit/miss counters
+    SQLiteCache: Persistent, compressed cache shared by processes on one host
+    TieredCache: MemoryCache in front of a SQLiteCache
+"""
+
+
+import asyncio
+import datetime
+import json
+import math
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, TypedDict
+
+from .columnar import ColumnBatch, _batch_types
+from .decoding import _field
+from .sqlitedb import SQLiteDatabase
+
+
+CacheStats = TypedDict("CacheStats", {
+    "hits": int,
+    "misses": int,
+    "evictions": int,
+    "size": int
+})
+
+# A TTL is either a number of seconds or a function of (query params, response data).
+# None means "do not cache", math.inf means "never expires".
+TTL = float | Callable[[dict[str, Any], Any], float | None] | None
+
+
+def _finalized_tx_ttl(params: dict[str, Any], data: Any) -> float | None:
+    if _field(data, "tx_status") not in (None, "finalized"):
+        return 5
+    return math.inf
+
+
+# Data younger than this may still be re-indexed by Solscan.
+finality_margin_seconds = 600
+
+
+def _closed_block_time_ttl(params: dict[str, Any], data: Any) -> float | None:
+    block_time = params.get("block_time")
+    if block_time and len(block_time) == 2 and block_time[1] < time.time() - finality_margin_seconds:
+        return math.inf
+    return None
+
+
+def _old_tx_ttl(params: dict[str, Any], data: Any) -> float | None:
+    # transaction actions carry no tx_status, so only a transaction past the margin is final
+    block_time = _field(data, "block_time")
+    if block_time and block_time < time.time() - finality_margin_seconds:
+        return math.inf
+    return 5
+
+
+def _past_dates_ttl(params: dict[str, Any], data: Any) -> float | None:
+    dates = params.get("time")
+    today = int(datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d"))
+    if dates and len(dates) == 2 and dates[1] < today:
+        return math.inf
+    return None
+
+
+default_ttls: dict[str, TTL] = {
+    "/transaction/detail": _finalized_tx_ttl,
+    "/transaction/actions": _old_tx_ttl,
+    "/block/detail": math.inf,
+    "/account/transfer": _closed_block_time_ttl,
+    "/token/price": _past_dates_ttl,
+    "/token/meta": 60,
+    "/market/info": 30,
+}
+
+
+class CachePolicy:
+    """Decides how long a response of an endpoint may be reused.
+
+    Args:
+        ttls (dict[str, TTL], optional): TTL per endpoint path such as "/token/meta". A TTL is
+            seconds, math.inf for immutable data, or a function of (params, data) returning
+            either. Paths that are not listed are not cached. Defaults to default_ttls.
+
+    Example:
+        policy = CachePolicy({**default_ttls, "/token/meta": 300})
+    """
+
+    def __init__(self, ttls: dict[str, TTL] = None):
+        self._ttls = dict(default_ttls if ttls is None else ttls)
+
+    def cacheable(self, path: str) -> bool:
+        return self._ttls.get(path) is not None
+
+    def ttl(self, path: str, params: dict[str, Any], data: Any) -> float | None:
+        ttl = self._ttls.get(path)
+        if callable(ttl):
+            ttl = ttl(params, data)
+        if ttl is None or ttl <= 0:
+            return None
+        return ttl
+
+
+class Cache:
+    """Base class for cache backends.
+
+    Values handed out by a cache are shared between callers and must be treated as read-only.
+    get and set are awaited on the event loop, so backends doing I/O must not block it.
+    """
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        """Returns (True, value) on a hit and (False, None) on a miss."""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: float, size: int = None):
+        """Stores `value` for `ttl` seconds. `size` is the length of the response body it was decoded from, if known."""
+        raise NotImplementedError
+
+    def stats(self) -> CacheStats:
+        raise NotImplementedError
+
+
+class MemoryCache(Cache):
+    """In-memory LRU cache with per-entry TTLs.
+
+    Entry counts alone do not bound memory, as one block or transaction detail can weigh a
+    thousand token metadata responses. Each value is also sized at `set` by the length of the
+    response body it came from, or, when the caller does not know it, by its compact JSON
+    encoding. The least recently used entries are evicted while either limit is exceeded. A
+    value larger than `max_bytes` is not kept at all.
+
+    Args:
+        max_entries (int, optional): Entries kept before the least recently used is evicted. Defaults to 10000.
+        max_bytes (int, optional): Approximate bytes of values kept before the least recently used is evicted. Defaults to 64 MiB.
+
+    Attributes:
+        bytes (int): Approximate bytes of the values kept
+    """
+
+    def __init__(self, *, max_entries: int = 10000, max_bytes: int = 64 << 20):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, Any, int]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    async def set(self, key: str, value: Any, ttl: float, size: int = None):
+        if self._max_entries <= 0:
+            return
+        if size is None:
+            size = _encoded_size(value)
+        if key in self._entries:
+            self._remove(key)
+        if size > self._max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value, size)
+        self.bytes += size
+        while len(self._entries) > self._max_entries or self.bytes > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        self.bytes -= self._entries.pop(key)[2]
+
+    def stats(self) -> CacheStats:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
+
+
+def _encoded_size(value: Any) -> int:
+    # ColumnBatch values, from DecodePool transforms, are sized as the list of their records
+    try:
+        import msgspec
+    except ImportError:
+        return len(json.dumps(value, separators=(",", ":"), default=list))
+    return len(msgspec.json.encode(value, enc_hook=list))
+
+
+def _to_builtins(value: Any) -> Any:
+    # typed decoders return msgspec Structs, which are stored as plain dicts
+    import msgspec
+    return msgspec.to_builtins(value)
+
+
+# Key of the envelope a ColumnBatch is stored in, which no API response has
+_batch_key = "__column_batch__"
+
+
+class SQLiteCache(Cache):
+    """Persistent cache stored in one SQLite file.
+
+    The database runs in WAL mode, so any number of processes can read while one writes,
+    and restarted workers reuse what earlier runs fetched. Values are stored as zlib
+    compressed JSON. A ColumnBatch, as produced by DecodePool transforms, is stored as its
+    records and type name, and rebuilt on lookup. When the stored values outgrow
+    `max_bytes`, the oldest entries are evicted first. Queries run in a worker thread, so
+    waiting for the write lock of another process, or an eviction, does not block the
+    event loop.
+
+    Args:
+        path (str): Database file path, created if missing.
+        max_bytes (int, optional): Compressed bytes kept before eviction. Defaults to 1 GiB.
+
+    Example:
+        cache = TieredCache(MemoryCache(), SQLiteCache("~/.cache/py3s.sqlite"))
+        client = Client(auth_token="...", cache=cache)
+    """
+
+    _evict_check_interval = 100
+
+    def __init__(self, path: str, *, max_bytes: int = 1 << 30):
+        self._db = SQLiteDatabase(path, [
+            "PRAGMA synchronous=NORMAL",
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, created REAL NOT NULL, expires REAL)",
+            "CREATE INDEX IF NOT EXISTS cache_created ON cache (created)",
+        ])
+        self._max_bytes = max_bytes
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def lookup(self, key: str) -> tuple[bool, Any, float, int]:
+        """Returns (hit, value, seconds until expiry, length of the stored JSON)."""
+        return await asyncio.to_thread(self._lookup, key)
+
+    def _lookup(self, key: str) -> tuple[bool, Any, float, int]:
+        with self._db.connection() as conn:
+            row = conn.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or (row[1] is not None and row[1] < now):
+                if row is not None:
+                    conn.execute("DELETE FROM cache WHERE key = ? AND expires < ?", (key, now))
+                self.misses += 1
+                return False, None, 0, 0
+            content = zlib.decompress(row[0])
+            value = json.loads(content)
+            if isinstance(value, dict) and _batch_key in value:
+                batch = _batch_types().get(value[_batch_key])
+                if batch is None:
+                    # written by a process knowing a ColumnBatch type this one does not
+                    self.misses += 1
+                    return False, None, 0, 0
+                value = batch(value["records"])
+            self.hits += 1
+            ttl = math.inf if row[1] is None else row[1] - now
+            return True, value, ttl, len(content)
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        hit, value, _, _ = await self.lookup(key)
+        return hit, value
+
+    async def set(self, key: str, value: Any, ttl: float, size: int = None):
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    def _set(self, key: str, value: Any, ttl: float):
+        if isinstance(value, ColumnBatch):
+            value = {_batch_key: type(value).__name__, "records": list(value)}
+        blob = zlib.compress(json.dumps(value, separators=(",", ":"), default=_to_builtins).encode())
+        now = time.time()
+        expires = None if math.isinf(ttl) else now + ttl
+        with self._db.connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO cache (key, value, size, created, expires) VALUES (?, ?, ?, ?, ?)", (key, blob, len(blob), now, expires))
+            self._writes += 1
+            if self._writes % self._evict_check_interval == 0:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        conn.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        # free a little more than needed so eviction does not run on every check
+        excess = total - self._max_bytes * 0.9
+        freed = 0
+        keys = []
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY created"):
+            keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM cache WHERE key = ?", keys)
+        self.evictions += len(keys)
+
+    def stats(self) -> CacheStats:
+        with self._db.connection() as conn:
+            size = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": size}
+
+    def close(self):
+        self._db.close()
+
+
+class TieredCache(Cache):
+    """MemoryCache in front of a SQLiteCache.
+
+    Every entry is kept in memory. Only entries living at least `min_disk_ttl` seconds are
+    written to disk, and disk hits are copied back to memory.
+
+    Args:
+        memory (MemoryCache): Fast front cache.
+        disk (SQLiteCache): Persistent back cache.
+        min_disk_ttl (float, optional): Shortest TTL worth persisting. Defaults to one hour.
+    """
+
+    def __init__(self, memory: MemoryCache, disk: SQLiteCache, *, min_disk_ttl: float = 3600):
+        self._memory = memory
+        self._disk = disk
+        self._min_disk_ttl = min_disk_ttl
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        hit, value = await self._memory.get(key)
+        if hit:
+            return hit, value
+        hit, value, ttl, size = await self._disk.lookup(key)
+        if hit:
+            await self._memory.set(key, value, ttl, size)
+        return hit, value
+
+    async def set(self, key: str, value: Any, ttl: float, size: int = None):
+        await self._memory.set(key, value, ttl, size)
+        if ttl >= self._min_disk_ttl:
+            await self._disk.set(key, value, ttl)
+
+    def stats(self) -> CacheStats:
+        memory = self._memory.stats()
+        disk = self._disk.stats()
+        return {
+            "hits": memory["hits"] + disk["hits"],
+            "misses": disk["misses"],
+            "evictions": memory["evictions"] + disk["evictions"],
+            "size": disk["size"],
+        }
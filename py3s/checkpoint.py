@@ -0,0 +1,143 @@
+"""
+Checkpoints of massive crawls.
+
+A crawl given a `checkpoint_path` appends every completed unit of work to a JSON lines
+file: a page number, a `before` cursor or a block time shard, with its results. The
+first line holds the crawl's arguments. Run again with the same path and arguments, the
+crawl reads the completed units back instead of requesting them, so a crawl that died at
+page 3,000 of 5,000 costs 2,000 more requests, not 5,000.
+
+Units are keyed, and a key written twice keeps one entry, so a unit completed before a
+restart is neither requested nor returned again. Page numbers only address the same rows
+while the data does not change, so a crawl of a block time filtered endpoint without a
+`block_time_range` is pinned on its first run to the block times up to then, and new
+activity cannot shift the pages of a resume. Pages of endpoints without a block time
+filter, such as token holders, can still shift between runs, and a resume may then repeat
+or miss rows at the edges of the pages completed before the restart.
+
+Example:
+    transfers = await client.massive_account_transfers(address, total_size=500_000, checkpoint_path="transfers.jsonl")
+
+Classes:
+    Checkpoint: Append-only log of the completed units of one crawl
+"""
+
+
+import json
+import os
+from enum import Enum
+from typing import Any, Iterator
+
+from .cache import _to_builtins
+from .columnar import ColumnBatch, _batch_types
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    return value
+
+
+class Checkpoint:
+    """Append-only log of the completed units of one crawl.
+
+    Keys are JSON values: page numbers, cursors, or block time ranges. Tuple results, as
+    returned by endpoints with a `total`, are restored as tuples. Typed Structs are stored,
+    and restored, as plain dicts. ColumnBatch results, as returned by DecodePool transforms
+    or columnar crawls, are stored as their records and restored as the same batch type.
+
+    Args:
+        path (str): File of the checkpoint, created if missing.
+        args (dict[str, Any]): Arguments identifying the crawl. Enums are stored by value.
+
+    Raises:
+        Exception: If the file holds the checkpoint of a crawl with other arguments.
+    """
+
+    def __init__(self, path: str, args: dict[str, Any]):
+        self.path = path
+        self.args = _normalize(args)
+        self._units: dict[str, Any] = {}
+        self._pins: dict[str, Any] = {}
+        if os.path.exists(path):
+            self._load()
+        self._file = open(path, "a", encoding="utf-8")
+        if os.path.getsize(path) == 0:
+            self._write({"args": self.args})
+
+    def _load(self):
+        with open(self.path, "rb+") as f:
+            content = f.read()
+            # a line cut short by a crash is dropped, so the next append starts on a fresh line
+            end = content.rfind(b"\n") + 1
+            if end < len(content):
+                f.truncate(end)
+        lines = content[:end].splitlines()
+        if not lines:
+            return
+        header = json.loads(lines[0])
+        if header.get("args") != self.args:
+            raise Exception(f"Checkpoint {self.path} belongs to a crawl with other arguments: {header.get('args')}")
+        for line in lines[1:]:
+            record = json.loads(line)
+            if "pin" in record:
+                self._pins[record["pin"]] = record["value"]
+                continue
+            data = record["data"]
+            if record.get("batch"):
+                batch = _batch_types().get(record["batch"])
+                if batch is None:
+                    raise Exception(f"Checkpoint {self.path} holds a {record['batch']}, which is not a known ColumnBatch type")
+                data = batch(data)
+            self._units[json.dumps(record["key"])] = tuple(data) if record.get("tuple") else data
+
+    def _write(self, record: dict[str, Any]):
+        self._file.write(json.dumps(record, separators=(",", ":"), default=_to_builtins) + "\n")
+        self._file.flush()
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    def get(self, key: Any) -> tuple[bool, Any]:
+        """Returns (True, data) if the unit `key` was completed, else (False, None)."""
+        key = json.dumps(_normalize(key))
+        if key in self._units:
+            return True, self._units[key]
+        return False, None
+
+    def put(self, key: Any, data: Any):
+        """Records the unit `key` as completed with `data`. Units already recorded are not written again."""
+        key = _normalize(key)
+        encoded = json.dumps(key)
+        if encoded in self._units:
+            return
+        self._units[encoded] = data
+        record = {"key": key, "data": data}
+        if isinstance(data, tuple):
+            record["tuple"] = True
+        elif isinstance(data, ColumnBatch):
+            record.update(data=list(data), batch=type(data).__name__)
+        self._write(record)
+
+    def pin(self, name: str, value: Any) -> Any:
+        """Returns the value pinned as `name` by an earlier run, else records `value` as it and returns it.
+
+        Arguments resolved at run time, such as a time range ending now, are pinned so that
+        a resumed crawl splits its work into the same units as the first run.
+        """
+        if name not in self._pins:
+            self._pins[name] = _normalize(value)
+            self._write({"pin": name, "value": self._pins[name]})
+        return self._pins[name]
+
+    def items(self) -> Iterator[tuple[Any, Any]]:
+        """Yields (key, data) of every completed unit."""
+        for key, data in self._units.items():
+            yield json.loads(key), data
+
+    def close(self):
+        self._file.close()
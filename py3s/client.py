@@ -5,8 +5,8 @@ This module provides a client for interacting with both the public and pro Solsc
 It handles authentication, rate limiting, and provides typed responses for API endpoints.
 
 Example:
-    client = Client(auth_token_file_path="path/to/token")
-    chain_info = await client.chain_info()
+    async with Client(auth_token_file_path="path/to/token") as client:
+        chain_info = await client.chain_info()
 
 Rate Limits:
     - V2 API: 1000 requests per minute
@@ -22,17 +22,34 @@ Classes:
 
 import asyncio
 import base64
+import collections
+import contextlib
+import contextvars
 from enum import Enum
+import json
 import math
 import statistics
 import time
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import unpad
 import getpass
-from typing import Any, Awaitable, Callable, TypeVar, TypedDict, List
-from pyrate_limiter import Duration, Limiter, Rate
+import itertools
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, TypeVar, TypedDict, List
 from loguru import logger
-import requests
+from .cache import Cache, CachePolicy, CacheStats, MemoryCache, _to_builtins
+from .checkpoint import Checkpoint, _normalize
+from .columnar import BalanceChangeBatch, DefiActivityBatch, TransferBatch
+from .decoding import Decoder, _field, default_decoder
+from .keypool import ApiKey, KeyPool, KeyStats
+from .metrics import Hooks, Metrics, MetricsSnapshot, RequestTrace
+from .pipeline import DecodePool
+from .ratelimit import RateController, RateStats, TokenBucket, WindowStore, retry_after
+from .retry import RetryPolicy, RetryStats
+from .scheduler import Priority, Scheduler, SchedulerStats
+from .singleflight import Singleflight, SingleflightStats
+from .tail import Cadence, FairSchedule, Poller
+from .transport import HttpxTransport, Transport, default_connect_timeout, default_pool_size, default_read_timeout
+from .watermark import MemoryWatermarkStore, WatermarkStore
 
 
 public_base_url = "https://public-api.solscan.io"
@@ -43,6 +60,21 @@ v3_max_requests_per_minute = 2000
 
 D = TypeVar("D")
 
+# Event loop time at which the current operation must be done, set by Client.deadline()
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("py3s_deadline", default=None)
+# Priority and tenant of the current operation, set by Client.priority()
+_priority: contextvars.ContextVar[tuple[Priority | None, str | None]] = contextvars.ContextVar("py3s_priority", default=(None, None))
+
+
+async def _gather(*aws: Awaitable[Any]) -> list[Any]:
+    """Like asyncio.gather, but the first failure cancels the awaitables still running."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
 RespData = TypedDict("RespData",{"success": bool,"data": D})
 
 Errors = TypedDict("Errors",{"code": int,"message": str})
@@ -701,6 +733,46 @@ NFTCollectionItem = TypedDict("NFTCollectionItem", {
     "info": NFTItemInfo
 })
 
+# Type of the `data` field per endpoint path, for typed decoding with MsgspecDecoder(schemas=endpoint_schemas)
+endpoint_schemas = {
+    "/account/transfer": List[Transfer],
+    "/account/token-accounts": List[TokenAccount],
+    "/account/defi/activities": List[DefiActivity],
+    "/account/balance_change": List[AccountChangeActivity],
+    "/account/transactions": List[Transaction],
+    "/account/stake": List[AccountStake],
+    "/account/detail": AccountDetail,
+    "/token/transfer": List[Transfer],
+    "/token/defi/activities": List[DefiActivity],
+    "/token/markets": List[Market],
+    "/token/list": List[Token],
+    "/token/trending": List[Token],
+    "/token/price": List[TokenPrice],
+    "/token/meta": TokenMeta,
+    "/token/top": List[TokenTop],
+    "/transaction/last": List[Transaction],
+    "/transaction/detail": TransactionDetail,
+    "/transaction/actions": TransactionAction,
+    "/block/detail": BlockDetail,
+    "/market/list": List[PoolMarket],
+    "/market/info": PoolMarketInfo,
+    "/market/volume": PoolMarketVolume,
+    "/monitor/usage": APIUsage,
+    "/nft/news": List[NFTInfo],
+    "/nft/activity": List[NFTActivity],
+    "/nft/collection/lists": List[NFTCollection],
+    "/nft/collection/items": List[NFTCollectionItem],
+}
+
+# ColumnBatch types returned by massive_* methods called with columnar=True, by tasker name
+columnar_batches = {
+    "account_transfers": TransferBatch,
+    "token_transfers": TransferBatch,
+    "account_balance_changes": BalanceChangeBatch,
+    "account_defi_activities": DefiActivityBatch,
+    "token_defi_activities": DefiActivityBatch,
+}
+
 class Client:
     """A client for interacting with the Solscan API.
 
@@ -708,9 +780,9 @@ class Client:
     various Solscan API endpoints. It supports both encrypted and unencrypted auth tokens.
 
     Attributes:
-        _headers (dict): HTTP headers including auth token
-        _max_requests_per_minute (int): Maximum allowed API requests per minute
-        _limiter (Limiter): Rate limiter to enforce request limits
+        _keys (KeyPool): Auth tokens, each with its own rate limiter
+        _max_requests_per_minute (int): Maximum allowed API requests per minute over all tokens
+        _transport (Transport): HTTP transport that owns the connection pools
 
     Example:
         client = Client(auth_token="your_token_here")
@@ -719,48 +791,200 @@ class Client:
 
         # Make API calls:
         account_info = await client.account_info("wallet_address")
+
+        # Close pooled connections when done, or use `async with Client(...) as client:`
+        await client.aclose()
     """
     
-    def __init__(self, *, auth_token: str=None, auth_token_file_path: str=None, aes_256_hex_password: str=None, max_requests_per_minute: int=v2_max_requests_per_minute):
+    def __init__(self, *, auth_token: str=None, auth_token_file_path: str=None, aes_256_hex_password: str=None, max_requests_per_minute: int=v2_max_requests_per_minute,
+                 auth_tokens: List[str]=None, limiter_store: WindowStore=None,
+                 transport: Transport=None, pool_size: int=default_pool_size, max_in_flight: int=32,
+                 connect_timeout: float=default_connect_timeout, read_timeout: float=default_read_timeout,
+                 cache: Cache=None, cache_policy: CachePolicy=None, decoder: Decoder=None, decode_pool: DecodePool=None,
+                 adaptive_rate: bool=True, usage_interval: float=300, retry_policy: RetryPolicy=None,
+                 watermark_store: WatermarkStore=None, tenant_weights: dict[str, float]=None, hooks: List[Hooks]=None):
         """Initialize a new Solscan API client.
 
         Args:
             auth_token (str, optional): The authentication token string. Either this or auth_token_file_path must be provided.
-            auth_token_file_path (str, optional): Path to file containing the auth token. Either this or auth_token must be provided.
+            auth_token_file_path (str, optional): Path to file containing the auth token, or several tokens one per line. Either this or auth_token must be provided.
             aes_256_hex_password (str, optional): 64-character hex password for decrypting an encrypted auth token. If not provided but token is encrypted, will prompt for password.
-            max_requests_per_minute (int, optional): Maximum API requests allowed per minute. Defaults to v2_max_requests_per_minute.
+            max_requests_per_minute (int, optional): Maximum API requests allowed per minute, per token. Defaults to v2_max_requests_per_minute.
+            auth_tokens (List[str], optional): Several auth tokens to spread requests over. Each gets its own limiter,
+                requests go to the least loaded one, and tokens answering 401/429 are cooled down.
+            limiter_store (WindowStore, optional): Store sharing the rate limit window of each token with other
+                processes or hosts using it, e.g. a SQLiteWindowStore or RedisWindowStore. Defaults to None,
+                a limiter private to this client.
+            transport (Transport, optional): HTTP transport to send requests with. Defaults to an HttpxTransport.
+            pool_size (int, optional): Connections kept per base URL by the default transport. Defaults to 100.
+            max_in_flight (int, optional): Maximum concurrent page requests of one massive crawl. Defaults to 32.
+            connect_timeout (float, optional): Seconds the default transport waits to connect. Defaults to 10.
+            read_timeout (float, optional): Seconds the default transport waits for each chunk of a response. Defaults to 30.
+            cache (Cache, optional): Cache for responses of cacheable endpoints. Defaults to a MemoryCache.
+            cache_policy (CachePolicy, optional): Which endpoints are cached and for how long. Defaults to CachePolicy().
+            decoder (Decoder, optional): Decodes response bodies. Defaults to the fastest JSON library installed.
+                Pass MsgspecDecoder(schemas=endpoint_schemas) to get typed Structs instead of dicts.
+            decode_pool (DecodePool, optional): Decodes and transforms response bodies in worker processes
+                instead of the event loop thread. Takes precedence over decoder. Defaults to None.
+            adaptive_rate (bool, optional): Adapt the request rate to 429/5xx responses, Retry-After headers,
+                latency and the remaining compute units. Defaults to True.
+            usage_interval (float, optional): Seconds between usage endpoint reports fed to the rate controller,
+                None to never ask. Defaults to 300.
+            retry_policy (RetryPolicy, optional): Backoff, attempt limits and retry budget for transport errors,
+                timeouts, 429 and 5xx responses. Defaults to RetryPolicy().
+            watermark_store (WatermarkStore, optional): Where sync_* methods keep what they have already returned.
+                Defaults to a MemoryWatermarkStore, use a SQLiteWatermarkStore to continue syncs across restarts.
+            tenant_weights (dict[str, float], optional): Share of the rate limit each tenant set with priority() gets
+                while several wait at the same priority. Tenants not listed weigh 1. Defaults to None.
+            hooks (List[Hooks], optional): Receivers of request events, e.g. a SpanHooks. The client always
+                records them in its own Metrics as well. Defaults to None.
 
         Raises:
-            Exception: If neither auth_token nor auth_token_file_path is provided
+            Exception: If none of auth_token, auth_tokens and auth_token_file_path is provided
             Exception: If aes_256_hex_password is provided but not 64 characters long
             Exception: If auth token decryption fails
         """
 
-        if not auth_token and not auth_token_file_path:
-            raise Exception("Must provide either auth_token or auth_token_file")
+        if not auth_token and not auth_tokens and not auth_token_file_path:
+            raise Exception("Must provide either auth_token, auth_tokens or auth_token_file")
+        tokens = list(auth_tokens or [])
+        if auth_token:
+            tokens.append(auth_token)
         if auth_token_file_path:
             with open(auth_token_file_path, "r") as f:
-                auth_token = f.read()
-                auth_token = auth_token.strip("\n\r\t ")
+                tokens.extend(line.strip("\n\r\t ") for line in f if line.strip("\n\r\t "))
         if not aes_256_hex_password:
             aes_256_hex_password = getpass.getpass("Enter solscan auth token decryption password(if have not, just press enter): ")
         if aes_256_hex_password:
             if len(aes_256_hex_password) != 64:
                 raise Exception("Hex Password must be 64 characters long")
-            encrypted_bytes = base64.b64decode(auth_token.encode('utf-8'))
-            iv = encrypted_bytes[:AES.block_size]
-            ciphertext = encrypted_bytes[AES.block_size:]
-            cipher = AES.new(bytes.fromhex(aes_256_hex_password), AES.MODE_CBC, iv)
-            decrypted_bytes = unpad(cipher.decrypt(ciphertext), AES.block_size)
-            auth_token = decrypted_bytes.decode('utf-8')
-        self._headers = {"content-type": "application/json", "token": auth_token}
-        self._max_requests_per_minute = max(1, max_requests_per_minute-10)
-        # self._max_requests_per_second = self._max_requests_per_minute / 60
-        self._limiter = Limiter(Rate(self._max_requests_per_minute, Duration.MINUTE))
+            tokens = [self._decrypt_token(token, aes_256_hex_password) for token in tokens]
+        self._keys = KeyPool([ApiKey(token, max_requests_per_minute, store=limiter_store) for token in tokens])
+        self._max_requests_per_minute = self._keys.max_requests_per_minute
+        self._pacer = TokenBucket(self._max_requests_per_minute / 60)
+        self._max_in_flight = max(1, max_in_flight)
+        self._transport = transport or HttpxTransport(pool_size=pool_size, connect_timeout=connect_timeout, read_timeout=read_timeout)
+        self._cache = cache or MemoryCache()
+        self._cache_policy = cache_policy or CachePolicy()
+        self._singleflight = Singleflight()
+        self._decoder = decoder or default_decoder()
+        self._decode_pool = decode_pool
+        self._rate = RateController(self._pacer, self._pacer.rate, usage_interval=usage_interval) if adaptive_rate else None
+        self._usage_task: asyncio.Task = None
+        self._retry = retry_policy or RetryPolicy()
+        self._watermarks = watermark_store or MemoryWatermarkStore()
+        self._cadence = Cadence()
+        self._scheduler = Scheduler(tenant_weights)
+        self._metrics = Metrics()
+        self._hooks: List[Hooks] = [self._metrics, *(hooks or [])]
+
+    @staticmethod
+    def _decrypt_token(auth_token: str, aes_256_hex_password: str) -> str:
+        encrypted_bytes = base64.b64decode(auth_token.encode('utf-8'))
+        iv = encrypted_bytes[:AES.block_size]
+        ciphertext = encrypted_bytes[AES.block_size:]
+        cipher = AES.new(bytes.fromhex(aes_256_hex_password), AES.MODE_CBC, iv)
+        decrypted_bytes = unpad(cipher.decrypt(ciphertext), AES.block_size)
+        return decrypted_bytes.decode('utf-8')
+
+    async def __aenter__(self) -> "Client":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the transport and release its pooled connections, and shut down the decode pool."""
+        if self._usage_task:
+            self._usage_task.cancel()
+        await self._transport.aclose()
+        if self._decode_pool:
+            self._decode_pool.close()
+
+    def cache_stats(self) -> CacheStats:
+        """Returns hit, miss and eviction counters of the response cache."""
+        return self._cache.stats()
+
+    @contextlib.asynccontextmanager
+    async def deadline(self, seconds: float):
+        """Bounds everything awaited inside the block, retries included, to `seconds`.
+
+        At the deadline the block is cancelled and raises TimeoutError. Requests in flight that
+        no other caller waits for are cancelled, and TimeoutError is raised once they have
+        closed their connections and freed their keys. Retries that could not finish in time
+        are not attempted, unless an identical call without a deadline, or with a later one,
+        shares the request, see get. Nested deadlines keep the earliest one.
+
+        Example:
+            async with client.deadline(0.8):
+                tx = await client.tx_detail(sig)
+        """
+        at = asyncio.get_running_loop().time() + seconds
+        outer = _deadline.get()
+        if outer is not None:
+            at = min(at, outer)
+        token = _deadline.set(at)
+        try:
+            async with asyncio.timeout_at(at):
+                yield
+        finally:
+            _deadline.reset(token)
+
+    @contextlib.contextmanager
+    def priority(self, priority: Priority = None, *, tenant: str = None):
+        """Sets the priority and tenant of every request made inside the block.
+
+        Requests wait for the rate limiter by priority, and tenants of one priority share it
+        by their tenant_weights. Without a priority, calls made with `_must=True`, such as
+        massive crawls and syncs, are BULK and the others NORMAL. Arguments left None keep
+        the values of an enclosing block. Tasks started inside the block inherit them.
+
+        Example:
+            with client.priority(Priority.INTERACTIVE, tenant="api"):
+                tx = await client.tx_detail(sig)
+        """
+        outer_priority, outer_tenant = _priority.get()
+        token = _priority.set((priority or outer_priority, tenant if tenant is not None else outer_tenant))
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def metrics(self) -> MetricsSnapshot:
+        """Returns in-flight gauges and per-endpoint counters, latency quantiles and limiter waits."""
+        return self._metrics.snapshot()
+
+    def prometheus_metrics(self) -> str:
+        """Returns the metrics of metrics() in the Prometheus text exposition format, to serve on a /metrics endpoint."""
+        return self._metrics.prometheus()
+
+    def rate_stats(self) -> RateStats | None:
+        """Returns the current request rate and what the rate controller learned, None if adaptive_rate is off."""
+        return self._rate.stats() if self._rate else None
+
+    def retry_stats(self) -> RetryStats:
+        """Returns how many requests were retried and what is left of the retry budget."""
+        return self._retry.stats()
+
+    def key_stats(self) -> List[KeyStats]:
+        """Returns request, error and in-flight counters of every auth token."""
+        return self._keys.stats()
+
+    def scheduler_stats(self) -> List[SchedulerStats]:
+        """Returns waiting and served requests, and the longest wait for the limiter, of every priority."""
+        return self._scheduler.stats()
+
+    def singleflight_stats(self) -> SingleflightStats:
+        """Returns how many requests were sent and how many were saved by sharing an identical in-flight request."""
+        return self._singleflight.stats()
 
     async def get(self, base_url: str, path: str, kwargs: dict[str, Any]={}, *, export: bool = False) -> D:
         """Makes a GET request to the Solscan API.
 
+        Concurrent identical calls of one priority share one request, which keeps retrying
+        until the latest deadline of its callers while each caller stops waiting at its own.
+        The request waits for the rate limiter as the first caller's tenant.
+
         Args:
             base_url (str): The base URL for the API (public or pro)
             path (str): The API endpoint path
@@ -770,6 +994,8 @@ class Client:
         Returns:
             D: The response data, typed according to the endpoint's return type.
             If export=True, returns the raw response content instead.
+            Cached results and results shared by concurrent identical calls are the same
+            object for every caller, and must not be modified.
 
         Raises:
             Exception: If the API request fails, with status code and error message.
@@ -779,12 +1005,12 @@ class Client:
             - 429: Too Many Requests - Rate limit exceeded
             - 500: Internal Server Error - Server-side error
         """
-        url = f"{base_url}/{path.lstrip('/')}"
+        path = f"/{path.lstrip('/')}"
+        url = f"{base_url}{path}"
+        params = {k: v for k, v in kwargs.items() if v is not None and k != "self" and k != "_must"}
         kvs = []
-        for key, value in kwargs.items():
-            if value is None or key == "self" or key == "_must":
-                continue
-            elif isinstance(value, list):
+        for key, value in params.items():
+            if isinstance(value, list):
                 for v in value:
                     kvs.append(f"{key}[]={v}")
             elif isinstance(value, bool):
@@ -797,33 +1023,110 @@ class Client:
             query_params = "&".join(kvs)
             url = f"{url}?{query_params}"
         must = kwargs.get("_must", False)
-        i = 0
+        cacheable = not export and self._cache_policy.cacheable(path)
+        if cacheable:
+            cache_key = f"{base_url}{path}?{'&'.join(sorted(kvs))}"
+            hit, data = await self._cache.get(cache_key)
+            for hook in self._hooks:
+                hook.cache_lookup(path, hit)
+            if hit:
+                return data
+
+        priority = _priority.get()[0] or (Priority.BULK if must else Priority.NORMAL)
+        flight = f"{export}:{must}:{priority.name}:{url}"
+
+        async def load() -> D:
+            data, size = await self._fetch(url, path, must=must, export=export, deadline=lambda: self._singleflight.deadline(flight))
+            if cacheable:
+                ttl = self._cache_policy.ttl(path, params, data)
+                if ttl:
+                    await self._cache.set(cache_key, data, ttl, size)
+            return data
+
+        at = _deadline.get()
+        if not must and self._retry.deadline is not None:
+            own = asyncio.get_running_loop().time() + self._retry.deadline
+            at = own if at is None else min(at, own)
+        # identical concurrent calls of one priority share one request, and its result or exception
+        async with asyncio.timeout_at(at):
+            return await self._singleflight.do(flight, load, deadline=at)
+
+    async def _fetch(self, url: str, path: str, *, must: bool, export: bool, deadline: Callable[[], float | None]) -> tuple[D, int]:
+        """Returns the data of the response, and the length of its body. `deadline` returns the current deadline of the call."""
+        priority, tenant = _priority.get()
+        if priority is None:
+            priority = Priority.BULK if must else Priority.NORMAL
+        trace = RequestTrace(path, url, priority.name.lower())
+        for hook in self._hooks:
+            hook.started(trace)
+        try:
+            return await self._send(url, path, trace, priority, tenant, must=must, export=export, deadline=deadline)
+        except BaseException as e:
+            trace.error = e
+            raise
+        finally:
+            trace.duration = time.monotonic() - trace.started
+            for hook in self._hooks:
+                hook.finished(trace)
+
+    async def _send(self, url: str, path: str, trace: RequestTrace, priority: Priority, tenant: str | None, *,
+                    must: bool, export: bool, deadline: Callable[[], float | None]) -> tuple[D, int]:
+        self._retry.record_request()
+        attempt = 0
         while True:
-            i += 1
+            # every attempt, retries included, waits for its turn, the pacer and a key's limiter
+            queued = time.monotonic()
+            async with self._scheduler.turn(priority, tenant):
+                await self._pacer.acquire()
+                key = await self._keys.acquire()
+            resp = None
+            error = None
+            start = time.monotonic()
+            trace.attempts += 1
+            trace.limiter_wait += start - queued
+            for hook in self._hooks:
+                hook.sent(trace)
             try:
-                self._limiter.try_acquire("get")
-                break
+                resp = await self._transport.get(url, key.headers)
             except Exception as e:
-                logger.error(f"Solscan client limiter waited {i} times: {e}")
-                await asyncio.sleep(1)
-        i = 0
-        while True:
-            i += 1
-            try:
-                resp = await asyncio.to_thread(requests.get, url, headers=self._headers)
+                error = e
+            finally:
+                wait = retry_after(resp.headers) if resp is not None else None
+                self._keys.release(key, resp.status_code if resp is not None else None, wait)
+            latency = time.monotonic() - start
+            status_code = resp.status_code if resp is not None else None
+            size = len(resp.content) if resp is not None else 0
+            trace.status = status_code
+            trace.bytes += size
+            for hook in self._hooks:
+                hook.attempted(trace, status_code, latency, size, start - queued, error)
+            if resp is not None and self._rate:
+                self._rate.observe(status_code, latency, resp.headers)
+                if self._rate.usage_due():
+                    self._usage_task = asyncio.create_task(self._sync_usage())
+            if status_code == 200:
                 break
-            except Exception as e:
-                if not must:
-                    raise e
-                logger.error(f"Solscan client retry {i} times: {e}")
-                await asyncio.sleep(1)
-                if i == 60:
-                    return await self.get(base_url, path, kwargs, export=export)
+            # a key that was refused is cooling down now, the request can go to another one right away
+            switch = status_code is not None and self._keys.can_retry(key, status_code)
+            if not switch and not self._retry.retryable(status_code):
+                break
+            attempt += 1
+            delay = 0 if switch else self._retry.delay(attempt, wait)
+            at = deadline()
+            remaining = at - asyncio.get_running_loop().time() if at is not None else None
+            if self._retry.give_up(attempt, delay, must, remaining) or not await self._retry.spend(must):
+                break
+            logger.error(f"Solscan client retry {attempt} times in {delay:.2f} seconds: {error or status_code}, {url}")
+            await asyncio.sleep(delay)
+        if error is not None:
+            raise error
         if resp.status_code == 200:
             if export:
-                return resp.content
+                return resp.content, size
+            elif self._decode_pool:
+                return await self._decode_pool.decode(resp.content, path), size
             else:
-                return resp.json()["data"]
+                return self._decoder.decode(resp.content, path), size
         elif resp.status_code == 401:
             raise Exception("401: Unauthorized")
         elif resp.status_code == 403:
@@ -837,45 +1140,361 @@ class Client:
         else:
             raise Exception(f"{resp.status_code}: {resp.text}")
         
-    async def massive_get(self, tasker: Callable[[], Awaitable[D]], kwargs: dict[str, Any]) -> D:
-        del kwargs["self"]
+    async def _sync_usage(self):
+        try:
+            usage = await self.api_usage()
+        except Exception as e:
+            logger.error(f"Solscan client usage sync failed: {e}")
+            return
+        if not isinstance(usage, dict):
+            usage = {name: getattr(usage, name, None) for name in APIUsage.__annotations__}
+        self._rate.observe_usage(usage)
+
+    async def stream_pages(self, tasker: Callable[[], Awaitable[D]], kwargs: dict[str, Any], *, buffer_size: int = None,
+                           pages: dict[int, D] = None) -> AsyncIterator[D]:
+        """Streams pages 1..ceil(total_size / page_size) of a paginated endpoint in page order.
+
+        Pages are fetched by at most `max_in_flight` workers, and every request waits on the
+        client's token bucket, so the crawl runs at a flat rate just under the quota without
+        blocking the event loop. Workers never run more than `buffer_size` pages ahead of the
+        consumer, which keeps memory flat when the consumer is slower than the network.
+
+        The crawl ends as soon as the end of the data is known: an empty page, or the `total`
+        of endpoints returning `(total, items)` pages. Requests already in flight for pages
+        past the end are cancelled. With `adaptive=True` in kwargs, the crawl starts with two
+        pages in flight and adds one more for every full page that comes back, and a short
+        page also ends the crawl, so overestimated `total_size` values cost little quota.
+
+        Args:
+            tasker (Callable): Paginated endpoint method, called with `page=`.
+            kwargs (dict[str, Any]): Arguments of a massive_* method, including `total_size`.
+            buffer_size (int, optional): Maximum pages fetched ahead of the consumer. Defaults to twice the workers.
+            pages (dict[int, D], optional): Results of pages already known, e.g. from a checkpoint.
+                They are yielded in their place without being requested. Defaults to None.
+
+        Yields:
+            D: The result of each non-empty page, in page order.
+        """
+        kwargs = {k: v for k, v in kwargs.items() if k != "self"}
         total_size = kwargs.pop("total_size")
+        adaptive = kwargs.pop("adaptive", False)
         page_size = kwargs["page_size"].value
         page_num = math.ceil(total_size / page_size)
-        group_size = self._max_requests_per_minute
-        group_num = math.ceil(page_num / group_size)
-        logger.info(f"Massive getting {total_size} items, {page_size} per page, {page_num} pages, {group_size} per group, {group_num} groups, tasker: {tasker.__name__}")
-        all_data = []
-        for group in range(group_num):
-            start_page = group * group_size + 1
-            end_page = min((group + 1) * group_size, page_num)
-            tasks = []
-            logger.info(f"Getting group {group} from {start_page} to {end_page}")
-            for page in range(start_page, end_page+1):
-                tasks.append(tasker(**kwargs, page=page))
-            start_time = time.time()
-            results = await asyncio.gather(*tasks)
-            end_time = time.time()
-            duration = end_time - start_time
-            has_no_more_data = False
-            num_of_data = 0
-            for result in results:
-                if isinstance(result, tuple):
-                    all_data.append(result)
-                else:
-                    if len(result) == 0:
-                        has_no_more_data = True
-                    else:
-                        all_data.extend(result)
-                        num_of_data += len(result)
-            logger.info(f"Group {group} got {num_of_data} data")
-            if group < group_num-1 and not has_no_more_data:
-                logger.info(f"Sleeping {max(0.1, 60 - duration+0.1)} seconds")
-                time.sleep(max(0.1, 60 - duration+0.1))
-            if has_no_more_data:
-                break
+        worker_num = min(page_num, self._max_in_flight)
+        buffer_size = max(worker_num, buffer_size or 2 * worker_num)
+        window = min(worker_num, 2) if adaptive else worker_num
+        logger.info(f"Streaming {total_size} items, {page_size} per page, {page_num} pages, {worker_num} in flight, adaptive: {adaptive}, tasker: {tasker.__name__}")
+        ready: dict[int, D] = {}
+        known = set(pages or ())
+        fetching: dict[asyncio.Task, int] = {}
+        next_fetch = 1
+        next_yield = 1
+        last_page = page_num
+        error: BaseException = None
+        changed = asyncio.Condition()
+
+        def end_at(page: int):
+            nonlocal last_page
+            if page >= last_page:
+                return
+            last_page = page
+            cancelled = [w for w, p in fetching.items() if p > last_page]
+            for w in cancelled:
+                del fetching[w]
+                w.cancel()
+            logger.info(f"Data of {tasker.__name__} ends at page {last_page}, cancelled {len(cancelled)} requests")
+
+        def arrived(page: int, result: D):
+            nonlocal window
+            ready[page] = result
+            items = result[1] if isinstance(result, tuple) else result
+            if isinstance(result, tuple):
+                end_at(math.ceil(result[0] / page_size))
+            if len(items) == 0:
+                end_at(page - 1)
+            elif len(items) < page_size and adaptive:
+                end_at(page)
+            elif adaptive:
+                window = min(worker_num, window + 1)
+
+        def skip_known():
+            nonlocal next_fetch
+            while next_fetch in known:
+                next_fetch += 1
+
+        for page in sorted(known):
+            if page <= last_page:
+                arrived(page, pages[page])
+        skip_known()
+
+        async def worker():
+            nonlocal next_fetch, error
+            me = asyncio.current_task()
+            while True:
+                async with changed:
+                    await changed.wait_for(lambda: next_fetch > last_page or (len(fetching) < window and next_fetch < next_yield + buffer_size))
+                    page = next_fetch
+                    next_fetch += 1
+                    skip_known()
+                    if page > last_page:
+                        return
+                    fetching[me] = page
+                try:
+                    result = await tasker(**kwargs, page=page)
+                except BaseException as e:
+                    # only cancellations of this worker, by end_at or by closing the stream, end it quietly
+                    if isinstance(e, asyncio.CancelledError) and me.cancelling():
+                        raise
+                    # any other failure must reach the consumer, or it would wait for the page forever
+                    error = Exception(f"Request of page {page} of {tasker.__name__} was cancelled") if isinstance(e, asyncio.CancelledError) else e
+                    result = None
+                async with changed:
+                    fetching.pop(me, None)
+                    if result is not None:
+                        arrived(page, result)
+                    changed.notify_all()
+                if error is not None:
+                    return
+
+        workers = [asyncio.create_task(worker()) for _ in range(worker_num)]
+        try:
+            while next_yield <= last_page:
+                async with changed:
+                    await changed.wait_for(lambda: error is not None or next_yield in ready or next_yield > last_page)
+                    if error is not None:
+                        raise error
+                    if next_yield > last_page:
+                        break
+                    result = ready.pop(next_yield)
+                    next_yield += 1
+                    changed.notify_all()
+                yield result
+        finally:
+            for w in workers:
+                w.cancel()
+
+    async def stream_items(self, tasker: Callable[[], Awaitable[D]], kwargs: dict[str, Any], *, buffer_size: int = None) -> AsyncIterator[Any]:
+        """Streams the items of stream_pages one by one, stopping after `total_size` items.
+
+        Pages returned as `(total, items)` tuples yield their items.
+        """
+        remaining = kwargs["total_size"]
+        async for result in self.stream_pages(tasker, kwargs, buffer_size=buffer_size):
+            items = result[1] if isinstance(result, tuple) else result
+            for item in items[:remaining]:
+                yield item
+            remaining -= len(items)
+            if remaining <= 0:
+                return
+
+    async def massive_get(self, tasker: Callable[[], Awaitable[D]], kwargs: dict[str, Any]) -> D:
+        """Collects every page of stream_pages into one list of at most `total_size` entries.
+
+        Pages returned as `(total, items)` tuples are appended whole, other pages are flattened.
+        When kwargs has a `shard_pages` value, the crawl is split by block time with sharded_get.
+        When kwargs has `columnar=True`, items are collected page by page into the tasker's
+        ColumnBatch type instead of a list.
+        When kwargs has a `checkpoint_path`, completed pages, or shards, are recorded there and
+        a crawl run again with the same arguments resumes from them. A `block_time_range` left
+        None is then pinned to the block times up to the first run, so rows arriving later do
+        not shift the pages of a resume. See Checkpoint.
+        """
+        kwargs = {k: v for k, v in kwargs.items() if k != "self"}
+        checkpoint_path = kwargs.pop("checkpoint_path", None)
+        if checkpoint_path:
+            args = {k: v for k, v in kwargs.items() if k not in ("total_size", "adaptive", "columnar", "_must")}
+            checkpoint = Checkpoint(checkpoint_path, {"tasker": tasker.__name__, **args})
+            logger.info(f"Resuming {tasker.__name__} from {len(checkpoint)} completed units in {checkpoint_path}")
+            try:
+                return await self._checkpointed_get(tasker, kwargs, checkpoint)
+            finally:
+                checkpoint.close()
+        return await self._checkpointed_get(tasker, kwargs, None)
+
+    async def _checkpointed_get(self, tasker: Callable[[], Awaitable[D]], kwargs: dict[str, Any], checkpoint: Checkpoint | None) -> D:
+        if checkpoint is not None and "block_time_range" in kwargs and not kwargs["block_time_range"]:
+            # new rows would move the rows of every page number between runs
+            kwargs["block_time_range"] = checkpoint.pin("block_time_range", [0, int(time.time())])
+        shard_pages = kwargs.pop("shard_pages", None)
+        if shard_pages:
+            return await self.sharded_get(tasker, kwargs, shard_pages=shard_pages, checkpoint=checkpoint)
+        columnar = kwargs.pop("columnar", False)
+        total_size = kwargs["total_size"]
+        start_time = time.time()
+        all_data = columnar_batches[tasker.__name__]() if columnar else []
+        pages = {key: data for key, data in checkpoint.items() if isinstance(key, int)} if checkpoint is not None else None
+        page = 0
+        async for result in self.stream_pages(tasker, kwargs, pages=pages):
+            page += 1
+            if checkpoint is not None:
+                checkpoint.put(page, result)
+            if isinstance(result, tuple):
+                all_data.append(result)
+            else:
+                all_data.extend(result)
+        logger.info(f"Massive got {len(all_data)} data in {time.time() - start_time:.2f} seconds, tasker: {tasker.__name__}")
         return all_data[:total_size]
+
+    async def sharded_get(self, tasker: Callable[[], Awaitable[D]], kwargs: dict[str, Any], *, shard_pages: int, lookahead: int = 4,
+                          checkpoint: Checkpoint = None) -> D:
+        """Crawls a block-time filtered endpoint in time shards of at most `shard_pages` pages.
+
+        `block_time_range` (defaulting to everything up to now) is bisected until probing page
+        `shard_pages + 1` of a window comes back empty, so no shard needs deep pages. Shards
+        are produced in `sort_order`, up to `lookahead` of them are crawled concurrently, and
+        their pages are concatenated in that order until `total_size` items are collected.
+
+        Args:
+            tasker (Callable): Paginated endpoint method accepting `block_time_range` and `page`.
+            kwargs (dict[str, Any]): Arguments of a massive_* method, including `total_size`.
+            shard_pages (int): Target maximum pages per shard.
+            lookahead (int, optional): Shards crawled concurrently. Defaults to 4.
+            checkpoint (Checkpoint, optional): Records completed shards, which are not crawled again, and the
+                time range of the first run, which later runs reuse. Defaults to None.
+
+        Returns:
+            D: At most `total_size` items in the requested sort order.
+        """
+        kwargs = {k: v for k, v in kwargs.items() if k not in ("self", "shard_pages", "adaptive")}
+        columnar = kwargs.pop("columnar", False)
+        total_size = kwargs.pop("total_size")
+        block_time_range = kwargs.pop("block_time_range", None) or [0, int(time.time())]
+        if checkpoint is not None:
+            # shards are keyed by their time range, which must not move with the time of a resume
+            block_time_range = checkpoint.pin("block_time_range", block_time_range)
+        desc = kwargs.get("sort_order", SortOrder.DESC) == SortOrder.DESC
+        start_time = time.time()
+        shards = self._time_shards(tasker, kwargs, block_time_range, shard_pages, desc)
+        running: collections.deque[asyncio.Task] = collections.deque()
+        all_data = columnar_batches[tasker.__name__]() if columnar else []
+        shard_num = 0
+
+        async def crawl(shard: List[int]) -> D:
+            if checkpoint is not None:
+                hit, data = checkpoint.get(shard)
+                if hit:
+                    return data
+            data = await self.massive_get(tasker, {**kwargs, "block_time_range": shard, "total_size": total_size, "adaptive": True})
+            if checkpoint is not None:
+                checkpoint.put(shard, data)
+            return data
+
+        try:
+            async for shard in shards:
+                shard_num += 1
+                running.append(asyncio.create_task(crawl(shard)))
+                while running and (len(running) >= lookahead or running[0].done()):
+                    all_data.extend(await running.popleft())
+                    if len(all_data) >= total_size:
+                        return all_data[:total_size]
+            while running:
+                all_data.extend(await running.popleft())
+                if len(all_data) >= total_size:
+                    break
+        finally:
+            for task in running:
+                task.cancel()
+            await shards.aclose()
+            logger.info(f"Sharded got {len(all_data)} data from {shard_num} shards in {time.time() - start_time:.2f} seconds, tasker: {tasker.__name__}")
+        return all_data[:total_size]
+
+    async def _time_shards(self, tasker: Callable[[], Awaitable[D]], kwargs: dict[str, Any], block_time_range: List[int], shard_pages: int, desc: bool) -> AsyncIterator[List[int]]:
+        """Yields block time windows holding at most `shard_pages` pages, newest first when desc."""
+        stack = [tuple(block_time_range)]
+        while stack:
+            start, end = stack.pop()
+            if start < end:
+                if await tasker(**kwargs, block_time_range=[start, end], page=shard_pages + 1):
+                    mid = (start + end) // 2
+                    # the half to emit first goes on top of the stack
+                    stack += [(start, mid), (mid + 1, end)] if desc else [(mid + 1, end), (start, mid)]
+                    continue
+            yield [start, end]
     
+    async def sync_get(self, tasker: Callable[[], Awaitable[D]], kwargs: dict[str, Any]) -> D:
+        """Returns the rows of a block-time filtered endpoint that are new since the last sync with the same arguments.
+
+        The first sync crawls the newest `max_size` rows. Later syncs request rows at or after
+        the watermark's block time, newest first, page by page until a short page, so an
+        address without new activity costs one request. Rows at the watermark's block time
+        whose trans_id was already returned are dropped, and so are exact duplicates of rows
+        pushed to the next page by activity arriving during the sync. The watermark is only
+        moved once the sync completed, so a failed sync is simply repeated.
+
+        Args:
+            tasker (Callable): Paginated endpoint method accepting `block_time_range`, `page` and `sort_order`.
+            kwargs (dict[str, Any]): Arguments of a sync_* method, including `max_size`.
+
+        Returns:
+            D: New rows, newest first.
+        """
+        kwargs = {k: v for k, v in kwargs.items() if k != "self"}
+        max_size = kwargs.pop("max_size")
+        args = {k: v for k, v in kwargs.items() if k != "_must"}
+        key = json.dumps({"tasker": tasker.__name__, **_normalize(args)}, sort_keys=True)
+        mark = await self._watermarks.get(key)
+        kwargs.update(page_size=LargePageSize.PAGE_SIZE_100, sort_order=SortOrder.DESC)
+        if mark is None:
+            rows = await self.massive_get(tasker, {**kwargs, "total_size": max_size, "adaptive": True})
+        else:
+            known = set(mark["trans_ids"])
+            kwargs["block_time_range"] = [mark["block_time"], int(time.time()) + 3600]
+            rows = []
+            page = 1
+            while True:
+                result = await tasker(**kwargs, page=page)
+                rows.extend(row for row in result if not (_field(row, "block_time") == mark["block_time"] and _field(row, "trans_id") in known))
+                if len(result) < LargePageSize.PAGE_SIZE_100.value:
+                    break
+                page += 1
+        new = []
+        seen = set()
+        for row in rows:
+            identity = json.dumps(row, sort_keys=True, default=_to_builtins)
+            if identity not in seen:
+                seen.add(identity)
+                new.append(row)
+        if new:
+            newest = max(_field(row, "block_time") for row in new)
+            trans_ids = {_field(row, "trans_id") for row in new if _field(row, "block_time") == newest}
+            if mark is not None and mark["block_time"] == newest:
+                trans_ids |= set(mark["trans_ids"])
+            await self._watermarks.set(key, {"block_time": newest, "trans_ids": sorted(trans_ids)})
+        logger.info(f"Synced {len(new)} new rows of {tasker.__name__}, watermark: {mark['block_time'] if mark else None}")
+        return new
+
+    async def get_many(self, fn: Callable[[str], Awaitable[D]], keys: Iterable[str], *, concurrency: int = None) -> tuple[dict[str, D], dict[str, Exception]]:
+        """Calls `fn` once per distinct key with bounded concurrency, collecting results and errors per key.
+
+        Every call goes through get, so cached keys are answered without a request and the
+        others wait for the rate limiter like any request. A failing key does not fail the
+        batch, its exception is returned instead.
+
+        Args:
+            fn (Callable[[str], Awaitable[D]]): Single-item method, e.g. self.tx_detail.
+            keys (Iterable[str]): Inputs, duplicates are looked up once.
+            concurrency (int, optional): Calls in flight at once. Defaults to max_in_flight.
+
+        Returns:
+            tuple[dict[str, D], dict[str, Exception]]: Results and errors keyed by input, in input order.
+        """
+        keys = list(dict.fromkeys(keys))
+        results: dict[str, D] = {}
+        errors: dict[str, Exception] = {}
+        pending = iter(keys)
+
+        async def worker():
+            for key in pending:
+                try:
+                    results[key] = await fn(key)
+                except Exception as e:
+                    errors[key] = e
+
+        await _gather(*[worker() for _ in range(min(len(keys), concurrency or self._max_in_flight))])
+        if errors:
+            logger.error(f"{fn.__name__} failed for {len(errors)} of {len(keys)} inputs")
+        return {k: results[k] for k in keys if k in results}, {k: errors[k] for k in keys if k in errors}
+
     async def test_speed(self):
         times = 10
         durations = []
@@ -960,8 +1579,52 @@ class Client:
                            flow: Flow = None,
                            page_size: LargePageSize = LargePageSize.PAGE_SIZE_100,
                            sort_order: SortOrder = SortOrder.DESC,
-                           _must: bool = True) -> List[Transfer]:
+                           shard_pages: int = None,
+                           columnar: bool = False,
+                           adaptive: bool = False,
+                           checkpoint_path: str = None,
+                           _must: bool = True) -> List[Transfer] | TransferBatch:
         return await self.massive_get(self.account_transfers, locals())
+
+    async def iter_account_transfers(self,
+                           address: str,
+                           *,
+                           total_size: int = LargePageSize.PAGE_SIZE_100.value,
+                           activity_type: AccountActivityType = None,
+                           token_account: str = None,
+                           from_address: str = None,
+                           to_address: str = None,
+                           token: str = None,
+                           amount_range: List[int] = None,
+                           block_time_range: List[int] = None,
+                           exclude_amount_zero: bool = False,
+                           flow: Flow = None,
+                           page_size: LargePageSize = LargePageSize.PAGE_SIZE_100,
+                           sort_order: SortOrder = SortOrder.DESC,
+                           adaptive: bool = False,
+                           _must: bool = True) -> AsyncIterator[Transfer]:
+        async for item in self.stream_items(self.account_transfers, locals()):
+            yield item
+
+    async def sync_account_transfers(self,
+                           address: str,
+                           *,
+                           activity_type: AccountActivityType = None,
+                           token_account: str = None,
+                           from_address: str = None,
+                           to_address: str = None,
+                           token: str = None,
+                           amount_range: List[int] = None,
+                           exclude_amount_zero: bool = False,
+                           flow: Flow = None,
+                           max_size: int = 10_000,
+                           _must: bool = True) -> List[Transfer]:
+        """Get the account transfers that are new since the last sync with the same filters. See sync_get.
+
+        Args:
+            max_size (int, optional): Most transfers returned by the first sync. Later syncs return every new transfer. Defaults to 10000.
+        """
+        return await self.sync_get(self.account_transfers, locals())
     
     async def account_token_accounts(self,
                        address: str,
@@ -980,8 +1643,22 @@ class Client:
                        type: TokenType = TokenType.TOKEN,
                        page_size: SmallPageSize = SmallPageSize.PAGE_SIZE_40,
                        hide_zero: bool = False,
+                       adaptive: bool = False,
+                       checkpoint_path: str = None,
                        _must: bool = True) -> List[TokenAccount]:
         return await self.massive_get(self.account_token_accounts, locals())
+
+    async def iter_account_token_accounts(self,
+                       address: str,
+                           *,
+                       total_size: int = SmallPageSize.PAGE_SIZE_40.value,
+                       type: TokenType = TokenType.TOKEN,
+                       page_size: SmallPageSize = SmallPageSize.PAGE_SIZE_40,
+                       hide_zero: bool = False,
+                       adaptive: bool = False,
+                       _must: bool = True) -> AsyncIterator[TokenAccount]:
+        async for item in self.stream_items(self.account_token_accounts, locals()):
+            yield item
     
     async def account_defi_activities(self,
                         address: str,
@@ -1045,8 +1722,30 @@ class Client:
                         page_size: SmallPageSize = SmallPageSize.PAGE_SIZE_40,
                         sort_by: SortBy = SortBy.BLOCK_TIME,
                         sort_order: SortOrder = SortOrder.DESC,
-                        _must: bool = True) -> List[DefiActivity]:
+                        shard_pages: int = None,
+                        columnar: bool = False,
+                        adaptive: bool = False,
+                        checkpoint_path: str = None,
+                        _must: bool = True) -> List[DefiActivity] | DefiActivityBatch:
         return await self.massive_get(self.account_defi_activities, locals())
+
+    async def iter_account_defi_activities(self,
+                        address: str,
+                           *,
+                        total_size: int = SmallPageSize.PAGE_SIZE_40.value,
+                        activity_type: ActivityType = None,
+                        from_address: str = None,
+                        platform: List[str] = None,
+                        source: List[str] = None,
+                        token: str = None,
+                        block_time_range: List[int] = None,
+                        page_size: SmallPageSize = SmallPageSize.PAGE_SIZE_40,
+                        sort_by: SortBy = SortBy.BLOCK_TIME,
+                        sort_order: SortOrder = SortOrder.DESC,
+                        adaptive: bool = False,
+                        _must: bool = True) -> AsyncIterator[DefiActivity]:
+        async for item in self.stream_items(self.account_defi_activities, locals()):
+            yield item
     
     async def account_balance_changes(self,
                         address: str,
@@ -1107,28 +1806,185 @@ class Client:
                         flow: Flow = None,
                         sort_by: SortBy = SortBy.BLOCK_TIME,
                         sort_order: SortOrder = SortOrder.DESC,
-                        _must: bool = True) -> List[AccountChangeActivity]:
+                        shard_pages: int = None,
+                        columnar: bool = False,
+                        adaptive: bool = False,
+                        checkpoint_path: str = None,
+                        _must: bool = True) -> List[AccountChangeActivity] | BalanceChangeBatch:
         return await self.massive_get(self.account_balance_changes, locals())
+
+    async def iter_account_balance_changes(self,
+                        address: str,
+                           *,
+                        total_size: int = LargePageSize.PAGE_SIZE_100.value,
+                        token: str = None,
+                        amount_range: List[int] = None,
+                        block_time_range: List[int] = None,
+                        page_size: LargePageSize = LargePageSize.PAGE_SIZE_100,
+                        remove_spam: bool = True,
+                        flow: Flow = None,
+                        sort_by: SortBy = SortBy.BLOCK_TIME,
+                        sort_order: SortOrder = SortOrder.DESC,
+                        adaptive: bool = False,
+                        _must: bool = True) -> AsyncIterator[AccountChangeActivity]:
+        async for item in self.stream_items(self.account_balance_changes, locals()):
+            yield item
+
+    async def sync_account_balance_changes(self,
+                        address: str,
+                           *,
+                        token: str = None,
+                        amount_range: List[int] = None,
+                        remove_spam: bool = True,
+                        flow: Flow = None,
+                        max_size: int = 10_000,
+                        _must: bool = True) -> List[AccountChangeActivity]:
+        """Get the balance changes of an account that are new since the last sync with the same filters. See sync_get.
+
+        Args:
+            max_size (int, optional): Most balance changes returned by the first sync. Later syncs return every new one. Defaults to 10000.
+        """
+        return await self.sync_get(self.account_balance_changes, locals())
     
     async def account_transactions(self, address: str, *,before: str = None, limit: SmallPageSize=SmallPageSize.PAGE_SIZE_40, _must: bool = False) -> List[Transaction]:
         return await self.get(pro_base_url, "/account/transactions", locals())
     
-    async def massive_account_transactions(self, address: str, *, total_size: int = SmallPageSize.PAGE_SIZE_40.value, before: str = None, limit: SmallPageSize=SmallPageSize.PAGE_SIZE_40, _must: bool = True) -> List[Transaction]:
+    async def massive_account_transactions(self, address: str, *, total_size: int = SmallPageSize.PAGE_SIZE_40.value, before: str = None, limit: SmallPageSize=SmallPageSize.PAGE_SIZE_40,
+                                           parallelism: int = 1, checkpoint_path: str = None, _must: bool = True) -> List[Transaction]:
+        """Get up to total_size account transactions, newest first, by walking the `before` cursor.
+
+        With parallelism > 1, the first page is used to estimate how far back total_size
+        transactions reach. That span is split into `parallelism` block-time windows, a cursor
+        transaction at the start of each window is looked up with account_balance_changes,
+        and the windows are walked concurrently and merged in order without duplicates.
+        The last window keeps walking until total_size is reached, so a low estimate costs
+        time but never data.
+
+        Args:
+            address (str): Account address
+            total_size (int, optional): Maximum transactions to return. Defaults to 40.
+            before (str, optional): Only return transactions older than this signature. Defaults to None.
+            limit (SmallPageSize, optional): Transactions per request. Defaults to 40.
+            parallelism (int, optional): Number of cursors walked concurrently. Defaults to 1.
+            checkpoint_path (str, optional): File recording every page walked by its `before` cursor.
+                Run again with the same arguments, the walk replays recorded pages instead of requesting them. Defaults to None.
+
+        Returns:
+            List[Transaction]: Transactions, newest first
+        """
+        if not checkpoint_path:
+            return await self._account_transactions(address, total_size, before, limit, parallelism, _must, None)
+        checkpoint = Checkpoint(checkpoint_path, {"tasker": "account_transactions", "address": address, "before": before, "limit": limit})
+        logger.info(f"Resuming account_transactions from {len(checkpoint)} completed units in {checkpoint_path}")
+        try:
+            return await self._account_transactions(address, total_size, before, limit, parallelism, _must, checkpoint)
+        finally:
+            checkpoint.close()
+
+    async def _account_transactions(self, address: str, total_size: int, before: str | None, limit: SmallPageSize, parallelism: int,
+                                    _must: bool, checkpoint: Checkpoint | None) -> List[Transaction]:
+        if parallelism <= 1:
+            return [tx async for tx in self.iter_account_transactions(address, total_size=total_size, before=before, limit=limit, _must=_must, _checkpoint=checkpoint)]
+        first = await self._transactions_page(address, before, limit, _must, checkpoint)
+        if len(first) < limit.value or len(first) >= total_size:
+            return first[:total_size]
+        newest, oldest = _field(first[0], "block_time"), _field(first[-1], "block_time")
+        step = max(1, newest - oldest) * (total_size - len(first)) / len(first) / parallelism
+        boundaries = [int(oldest - step * k) for k in range(1, parallelism)]
+        cursors = await _gather(*[self._transaction_cursor(address, t, _must) for t in boundaries])
+        starts = [(_field(first[-1], "tx_hash"), oldest)]
+        for cursor in cursors:
+            if cursor is not None and cursor[1] <= starts[-1][1] and cursor[0] not in (s[0] for s in starts):
+                starts.append(cursor)
+        logger.info(f"Walking {len(starts)} cursors of account {address} transactions in parallel")
+        max_size = total_size - len(first)
+        # the open-ended last window is bounded by its estimated share and extended below if needed
+        last_size = math.ceil(max_size / len(starts))
+        segments = await _gather(*[
+            self._walk_transactions(address, start[0], limit, _must, starts[i+1], max_size, checkpoint) if i+1 < len(starts) else
+            self._walk_transactions(address, start[0], limit, _must, None, last_size, checkpoint)
+            for i, start in enumerate(starts)
+        ])
         trans = []
-        page_num = math.ceil(total_size / limit.value)
-        for i in range(page_num):
-            new_trans = await self.account_transactions(address, before=before, limit=limit, _must=_must)
-            if not new_trans:
-                break
-            trans.extend(new_trans)
-            before = new_trans[-1]["tx_hash"]
+        seen = set()
+        for tx in itertools.chain(first, *segments):
+            if _field(tx, "tx_hash") not in seen:
+                seen.add(_field(tx, "tx_hash"))
+                trans.append(tx)
+        if len(trans) < total_size and len(segments[-1]) >= last_size:
+            async for tx in self.iter_account_transactions(address, total_size=total_size - len(trans), before=_field(trans[-1], "tx_hash"), limit=limit, _must=_must, _checkpoint=checkpoint):
+                if _field(tx, "tx_hash") not in seen:
+                    trans.append(tx)
         return trans[:total_size]
+
+    async def _transaction_cursor(self, address: str, block_time: int, _must: bool) -> tuple[str, int] | None:
+        """Finds (tx_hash, block_time) of the newest account transaction at or before block_time."""
+        changes = await self.account_balance_changes(address, block_time_range=[0, block_time], page_size=LargePageSize.PAGE_SIZE_10, _must=_must)
+        if not changes:
+            return None
+        return _field(changes[0], "trans_id"), _field(changes[0], "block_time")
+
+    async def _transactions_page(self, address: str, before: str | None, limit: SmallPageSize, _must: bool, checkpoint: Checkpoint | None) -> List[Transaction]:
+        """Gets the account transactions page after `before`, from the checkpoint when it was walked before."""
+        if checkpoint is not None:
+            hit, page = checkpoint.get(before)
+            if hit:
+                return page
+        page = await self.account_transactions(address, before=before, limit=limit, _must=_must)
+        if checkpoint is not None:
+            checkpoint.put(before, page)
+        return page
+
+    async def _walk_transactions(self, address: str, before: str, limit: SmallPageSize, _must: bool, end: tuple[str, int] | None, max_size: int,
+                                 checkpoint: Checkpoint | None) -> List[Transaction]:
+        """Walks transactions older than `before` until the `end` cursor, which is included, or max_size."""
+        trans = []
+        while len(trans) < max_size:
+            page = await self._transactions_page(address, before, limit, _must, checkpoint)
+            for tx in page:
+                if end and _field(tx, "block_time") < end[1]:
+                    return trans
+                trans.append(tx)
+                if end and _field(tx, "tx_hash") == end[0]:
+                    return trans
+            if len(page) < limit.value:
+                return trans
+            before = _field(page[-1], "tx_hash")
+        return trans
+
+    async def iter_account_transactions(self, address: str, *, total_size: int = SmallPageSize.PAGE_SIZE_40.value, before: str = None, limit: SmallPageSize=SmallPageSize.PAGE_SIZE_40, _must: bool = True,
+                                        _checkpoint: Checkpoint = None) -> AsyncIterator[Transaction]:
+        """Streams account transactions by walking the `before` cursor.
+
+        The next page is requested as soon as the current page arrives, so one page is
+        always buffered while the consumer handles the current one. Pages recorded in
+        `_checkpoint` are replayed from it instead of requested.
+        """
+        remaining = total_size
+        fetch = asyncio.create_task(self._transactions_page(address, before, limit, _must, _checkpoint))
+        try:
+            while remaining > 0:
+                new_trans = await fetch
+                if not new_trans:
+                    return
+                new_trans = new_trans[:remaining]
+                remaining -= len(new_trans)
+                if remaining > 0:
+                    fetch = asyncio.create_task(self._transactions_page(address, _field(new_trans[-1], "tx_hash"), limit, _must, _checkpoint))
+                for tx in new_trans:
+                    yield tx
+        finally:
+            fetch.cancel()
     
     async def account_stakes(self, address: str, *, page: int = 1, page_size: SmallPageSize = SmallPageSize.PAGE_SIZE_40) -> List[AccountStake]:
         return await self.get(pro_base_url, "/account/stake", locals())
     
     async def account_detail(self, address: str) -> AccountDetail:
         return await self.get(pro_base_url, "/account/detail", locals())
+
+    async def account_detail_many(self, addresses: Iterable[str], *, concurrency: int = None) -> tuple[dict[str, AccountDetail], dict[str, Exception]]:
+        """Get account details of many addresses. See get_many."""
+        return await self.get_many(self.account_detail, addresses, concurrency=concurrency)
     
     async def account_rewards_export(self, address:str, *, time_from:int, time_to:int) -> bytes:
         return await self.get(pro_base_url, "/account/reward/export", locals(), export=True)
@@ -1249,8 +2105,30 @@ class Client:
                        page_size:LargePageSize = LargePageSize.PAGE_SIZE_100,
                        sort_by:SortBy = SortBy.BLOCK_TIME,
                        sort_order:SortOrder = SortOrder.DESC,
-                       _must: bool=True) -> List[Transfer]:
-        return await self.massive_get(self.token_transfers, locals())  
+                       shard_pages: int = None,
+                       columnar: bool = False,
+                       adaptive: bool = False,
+                       checkpoint_path: str = None,
+                       _must: bool=True) -> List[Transfer] | TransferBatch:
+        return await self.massive_get(self.token_transfers, locals())
+
+    async def iter_token_transfers(self,
+                       address:str,
+                       *,
+                       total_size: int = LargePageSize.PAGE_SIZE_100.value,
+                       activity_type:ActivityType = None,
+                       from_address:str = None,
+                       to_address:str = None,
+                       amount_range:List[int] = None,
+                       block_time_range:List[int] = None,
+                       exclude_amount_zero:bool=False,
+                       page_size:LargePageSize = LargePageSize.PAGE_SIZE_100,
+                       sort_by:SortBy = SortBy.BLOCK_TIME,
+                       sort_order:SortOrder = SortOrder.DESC,
+                       adaptive: bool = False,
+                       _must: bool=True) -> AsyncIterator[Transfer]:
+        async for item in self.stream_items(self.token_transfers, locals()):
+            yield item
 
     async def token_defi_activities(self,
                              address:str,
@@ -1319,8 +2197,46 @@ class Client:
                              page_size:LargePageSize = LargePageSize.PAGE_SIZE_100,
                              sort_by:SortBy = SortBy.BLOCK_TIME,
                              sort_order:SortOrder = SortOrder.DESC,
-                             _must: bool=True) -> List[DefiActivity]:
+                             columnar: bool = False,
+                             adaptive: bool = False,
+                             checkpoint_path: str = None,
+                             _must: bool=True) -> List[DefiActivity] | DefiActivityBatch:
         return await self.massive_get(self.token_defi_activities, locals())
+
+    async def iter_token_defi_activities(self,
+                             address:str,
+                             *,
+                             total_size: int = LargePageSize.PAGE_SIZE_100.value,
+                             from_address:str = None,
+                             platform:List[str] = None,
+                             source:List[str] = None,
+                             activity_type:ActivityType = None,
+                             token:str = None,
+                             block_time_range:List[int] = None,
+                             page_size:LargePageSize = LargePageSize.PAGE_SIZE_100,
+                             sort_by:SortBy = SortBy.BLOCK_TIME,
+                             sort_order:SortOrder = SortOrder.DESC,
+                             adaptive: bool = False,
+                             _must: bool=True) -> AsyncIterator[DefiActivity]:
+        async for item in self.stream_items(self.token_defi_activities, locals()):
+            yield item
+
+    async def sync_token_defi_activities(self,
+                             address:str,
+                             *,
+                             from_address:str = None,
+                             platform:List[str] = None,
+                             source:List[str] = None,
+                             activity_type:ActivityType = None,
+                             token:str = None,
+                             max_size: int = 10_000,
+                             _must: bool=True) -> List[DefiActivity]:
+        """Get the DeFi activities of a token that are new since the last sync with the same filters. See sync_get.
+
+        Args:
+            max_size (int, optional): Most activities returned by the first sync. Later syncs return every new one. Defaults to 10000.
+        """
+        return await self.sync_get(self.token_defi_activities, locals())
     
     async def token_markets(self,
                       token_pair:List[str],
@@ -1343,8 +2259,13 @@ class Client:
         return await self.get(pro_base_url, "/token/list", locals())
     
     async def massive_token_list(self, *, total_size: int = LargePageSize.PAGE_SIZE_100.value, sort_by:TokenSortBy = TokenSortBy.PRICE, 
-                                 sort_order:SortOrder = SortOrder.DESC, page_size:LargePageSize = LargePageSize.PAGE_SIZE_100, _must: bool=True) -> List[Token]:
+                                 sort_order:SortOrder = SortOrder.DESC, page_size:LargePageSize = LargePageSize.PAGE_SIZE_100, adaptive: bool = False, checkpoint_path: str = None, _must: bool=True) -> List[Token]:
         return await self.massive_get(self.token_list, locals())
+
+    async def iter_token_list(self, *, total_size: int = LargePageSize.PAGE_SIZE_100.value, sort_by:TokenSortBy = TokenSortBy.PRICE, 
+                                 sort_order:SortOrder = SortOrder.DESC, page_size:LargePageSize = LargePageSize.PAGE_SIZE_100, adaptive: bool = False, _must: bool=True) -> AsyncIterator[Token]:
+        async for item in self.stream_items(self.token_list, locals()):
+            yield item
     
     async def token_trending(self, *, limit:int = 10) -> List[Token]:
         return await self.get(pro_base_url, "/token/trending", locals())
@@ -1391,6 +2312,8 @@ class Client:
                              from_amount: str=None,
                              to_amount: str=None,
                              page_size:SmallPageSize = SmallPageSize.PAGE_SIZE_40,
+                             adaptive: bool = False,
+                             checkpoint_path: str = None,
                              _must: bool=True) -> tuple[int, List[TokenHolder]]:
         args = locals()
         num = 0
@@ -1399,9 +2322,25 @@ class Client:
             holders.extend(h[1])
             num = h[0]
         return num, holders[:total_size]
+
+    async def iter_token_holders(self,
+                             address: str,
+                             *,
+                             total_size: int = SmallPageSize.PAGE_SIZE_40.value,
+                             from_amount: str=None,
+                             to_amount: str=None,
+                             page_size:SmallPageSize = SmallPageSize.PAGE_SIZE_40,
+                             adaptive: bool = False,
+                             _must: bool=True) -> AsyncIterator[TokenHolder]:
+        async for holder in self.stream_items(self.token_holders, locals()):
+            yield holder
     
     async def token_meta(self, address: str) -> TokenMeta:
         return await self.get(pro_base_url, "/token/meta", locals())
+
+    async def token_meta_many(self, addresses: Iterable[str], *, concurrency: int = None) -> tuple[dict[str, TokenMeta], dict[str, Exception]]:
+        """Get token metadata of many mints. See get_many."""
+        return await self.get_many(self.token_meta, addresses, concurrency=concurrency)
     
     async def token_top(self, *, limit:int = 10) -> List[TokenTop]:
         return await self.get(pro_base_url, "/token/top", locals())
@@ -1411,17 +2350,124 @@ class Client:
 
     async def tx_detail(self, tx: str) -> TransactionDetail:
         return await self.get(pro_base_url, "/transaction/detail", locals())
+
+    async def tx_detail_many(self, txs: Iterable[str], *, concurrency: int = None) -> tuple[dict[str, TransactionDetail], dict[str, Exception]]:
+        """Get details of many transactions. See get_many."""
+        return await self.get_many(self.tx_detail, txs, concurrency=concurrency)
     
     async def tx_actions(self, tx: str) -> TransactionAction:
         return await self.get(pro_base_url, "/transaction/actions", locals())
 
+    async def tx_actions_many(self, txs: Iterable[str], *, concurrency: int = None) -> tuple[dict[str, TransactionAction], dict[str, Exception]]:
+        """Get actions of many transactions. See get_many."""
+        return await self.get_many(self.tx_actions, txs, concurrency=concurrency)
+
     async def block_last(self, *, limit: LargePageSize=LargePageSize.PAGE_SIZE_100) -> BlockDetail:
         return await self.get(pro_base_url, "/block/last", locals())
 
+    async def _refresh_cadence(self):
+        if self._cadence.stale():
+            try:
+                self._cadence.observe(await self.chain_info())
+            except Exception as e:
+                logger.error(f"Solscan client chain info failed, keeping the last cadence: {e}")
+
+    async def tail_transactions(self, *, filter: TxFilter = TxFilter.ALL, min_interval: float = 0.5, max_interval: float = 2,
+                                seen_size: int = 100_000) -> AsyncIterator[Transaction]:
+        """Streams transactions as they appear in tx_last, oldest first, each once.
+
+        The polling interval follows the chain's transaction rate, measured with chain_info,
+        so each poll is about half new. See Poller.
+
+        Args:
+            filter (TxFilter, optional): Transactions to include. Defaults to all.
+            min_interval (float, optional): Shortest polling interval in seconds. Defaults to 0.5.
+            max_interval (float, optional): Longest polling interval in seconds, which bounds the latency. Defaults to 2.
+            seen_size (int, optional): Signatures remembered for deduplication. Defaults to 100000.
+        """
+        limit = LargePageSize.PAGE_SIZE_100
+        poller = Poller(lambda: self.tx_last(limit=limit, filter=filter), lambda tx: _field(tx, "tx_hash"), lambda: self._cadence.tx_per_second, limit.value,
+                        refresh=self._refresh_cadence, min_interval=min_interval, max_interval=max_interval, seen_size=seen_size)
+        async for tx in poller:
+            yield tx
+
+    async def tail_blocks(self, *, min_interval: float = 0.5, max_interval: float = 2, seen_size: int = 10_000) -> AsyncIterator[BlockDetail]:
+        """Streams blocks as they appear in block_last, oldest first, each once.
+
+        The polling interval follows the slot time measured with chain_info. See Poller.
+
+        Args:
+            min_interval (float, optional): Shortest polling interval in seconds. Defaults to 0.5.
+            max_interval (float, optional): Longest polling interval in seconds, which bounds the latency. Defaults to 2.
+            seen_size (int, optional): Blocks remembered for deduplication. Defaults to 10000.
+        """
+        limit = LargePageSize.PAGE_SIZE_100
+        poller = Poller(lambda: self.block_last(limit=limit), lambda block: _field(block, "current_slot"), lambda: 1 / self._cadence.slot_seconds, limit.value,
+                        refresh=self._refresh_cadence, min_interval=min_interval, max_interval=max_interval, seen_size=seen_size)
+        async for block in poller:
+            yield block
+
+    async def tail_accounts(self, addresses: Iterable[str], *, sync: Callable[..., Awaitable[list]] = None, initial_size: int = 100,
+                            min_interval: float = 1, max_interval: float = 60, concurrency: int = 8) -> AsyncIterator[tuple[str, Any]]:
+        """Streams the new activity of many accounts as (address, row) pairs.
+
+        Each account is polled with an incremental sync, so a poll without activity costs one
+        request. A FairSchedule picks the accounts: active ones are polled every `min_interval`,
+        idle ones back off to `max_interval`, and accounts due together take turns, so a busy
+        account cannot starve the others when the rate limit is the bottleneck.
+
+        Args:
+            addresses (Iterable[str]): Accounts to watch.
+            sync (Callable, optional): Sync method called with an address and `max_size`. Defaults to sync_account_transfers.
+            initial_size (int, optional): Rows returned by the first sync of an account without a watermark. Defaults to 100.
+            min_interval (float, optional): Polling interval of active accounts in seconds. Defaults to 1.
+            max_interval (float, optional): Polling interval of idle accounts in seconds. Defaults to 60.
+            concurrency (int, optional): Accounts polled at the same time. Defaults to 8.
+        """
+        sync = sync or self.sync_account_transfers
+        schedule = FairSchedule(addresses, min_interval=min_interval, max_interval=max_interval)
+        rows: asyncio.Queue[tuple[str, list]] = asyncio.Queue(maxsize=concurrency)
+
+        async def worker():
+            while True:
+                address = await schedule.next()
+                try:
+                    new = await sync(address, max_size=initial_size)
+                except Exception as e:
+                    logger.error(f"Solscan client tail of {address} failed: {e}")
+                    new = []
+                schedule.done(address, bool(new))
+                if new:
+                    await rows.put((address, new))
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, len(schedule))))]
+        try:
+            while True:
+                address, new = await rows.get()
+                # sync results are newest first
+                for row in reversed(new):
+                    yield address, row
+        finally:
+            for w in workers:
+                w.cancel()
+
     async def block_transactions(self, block: int, *, page: int = 1, page_size: LargePageSize = LargePageSize.PAGE_SIZE_100) -> tuple[int, List[Transaction]]:
         data = await self.get(pro_base_url, "/block/transactions", locals())
         return data["total"], data["transactions"]
 
+    async def massive_block_transactions(self, block: int, *, total_size: int = LargePageSize.PAGE_SIZE_100.value, page_size: LargePageSize = LargePageSize.PAGE_SIZE_100, adaptive: bool = False, checkpoint_path: str = None) -> tuple[int, List[Transaction]]:
+        args = locals()
+        num = 0
+        txs = []
+        for t in await self.massive_get(self.block_transactions, args):
+            txs.extend(t[1])
+            num = t[0]
+        return num, txs[:total_size]
+
+    async def iter_block_transactions(self, block: int, *, total_size: int = LargePageSize.PAGE_SIZE_100.value, page_size: LargePageSize = LargePageSize.PAGE_SIZE_100, adaptive: bool = False) -> AsyncIterator[Transaction]:
+        async for tx in self.stream_items(self.block_transactions, locals()):
+            yield tx
+
     async def block_detail(self, block: int) -> BlockDetail:
         return await self.get(pro_base_url, "/block/detail", locals())
     
@@ -1527,5 +2573,7 @@ if __name__ == "__main__":
     account = "1HBjhkQvVzNpLyp8REVjZTQ5NCR2qtMgiMNa2ViSA98"
     home = str(pathlib.Path.home())
     token_file = os.path.join(home, "test_tokens/solscan_auth_token_unencrypted")
-    client = Client(auth_token_file_path=token_file)
-    data = asyncio.run(client.test_speed())
+    async def main():
+        async with Client(auth_token_file_path=token_file) as client:
+            await client.test_speed()
+    asyncio.run(main())
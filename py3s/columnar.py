@@ -0,0 +1,181 @@
+"""
+Columnar containers for large result sets.
+
+A list of one million Transfer dicts repeats the same keys a million times and keeps every
+integer as a separate Python object. A ColumnBatch keeps each integer field in one
+contiguous `array` and each string field as a list of interned strings, so repeated
+addresses are stored once. Integer columns export to NumPy and Arrow without copying.
+
+Example:
+    batch = await client.massive_account_transfers(address, total_size=500_000, columnar=True)
+    amounts = batch.to_numpy()["amount"]
+    big = batch.filter(amounts > 10**9)
+
+Classes:
+    ColumnBatch: Base class of columnar record containers
+    TransferBatch: Columns of Transfer records
+    BalanceChangeBatch: Columns of AccountChangeActivity records
+    DefiActivityBatch: Columns of DefiActivity records
+"""
+
+
+import itertools
+import sys
+from array import array
+from typing import Any, Iterable, Iterator, Sequence
+
+from .decoding import _field
+
+
+# Column kinds besides `array` typecodes
+STR = "str"
+OBJ = "obj"
+
+
+class ColumnBatch:
+    """Columnar container of records sharing one schema.
+
+    Subclasses declare `columns`, mapping each record key to an `array` typecode for
+    integer fields, STR for strings, which are interned, or OBJ for nested values kept
+    as they are. Missing integer values are stored as 0.
+    """
+
+    columns: dict[str, str] = {}
+
+    def __init__(self, records: Iterable[dict[str, Any]] = ()):
+        self._data: dict[str, array | list] = {
+            name: array(kind) if kind not in (STR, OBJ) else [] for name, kind in self.columns.items()
+        }
+        self.extend(records)
+
+    def __len__(self) -> int:
+        return len(next(iter(self._data.values()))) if self._data else 0
+
+    def __getitem__(self, index: int | slice) -> "dict[str, Any] | ColumnBatch":
+        if isinstance(index, slice):
+            batch = type(self)()
+            batch._data = {name: column[index] for name, column in self._data.items()}
+            return batch
+        return {name: column[index] for name, column in self._data.items()}
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, record: dict[str, Any]):
+        for name, kind in self.columns.items():
+            value = _field(record, name)
+            if kind == STR:
+                self._data[name].append(sys.intern(value) if isinstance(value, str) else value)
+            elif kind == OBJ:
+                self._data[name].append(value)
+            else:
+                self._data[name].append(value or 0)
+
+    def extend(self, records: "Iterable[dict[str, Any]] | ColumnBatch"):
+        if isinstance(records, ColumnBatch):
+            for name, column in self._data.items():
+                column.extend(records._data[name])
+            return
+        for record in records:
+            self.append(record)
+
+    def column(self, name: str) -> array | list:
+        """Returns the underlying column. Integer columns are `array`s."""
+        return self._data[name]
+
+    def filter(self, mask: Sequence[bool]) -> "ColumnBatch":
+        """Returns a new batch with the rows where mask is true, e.g. a NumPy boolean array."""
+        batch = type(self)()
+        for name, column in self._data.items():
+            kept = itertools.compress(column, mask)
+            batch._data[name] = array(column.typecode, kept) if isinstance(column, array) else list(kept)
+        return batch
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Returns one NumPy array per column. Integer columns share memory with the batch."""
+        try:
+            import numpy as np
+        except ImportError:
+            raise Exception("to_numpy requires numpy, install it with: pip install numpy")
+        arrays = {}
+        for name, column in self._data.items():
+            if isinstance(column, array):
+                arrays[name] = np.frombuffer(column, dtype=np.dtype(column.typecode)) if len(column) else np.array([], dtype=np.dtype(column.typecode))
+            else:
+                arrays[name] = np.array(column, dtype=object)
+        return arrays
+
+    def to_arrow(self) -> Any:
+        """Returns a pyarrow Table. Integer columns wrap the batch memory without copying."""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise Exception("to_arrow requires pyarrow, install it with: pip install pyarrow")
+        types = {"q": pa.int64(), "Q": pa.uint64(), "B": pa.uint8()}
+        arrays = {}
+        for name, column in self._data.items():
+            if isinstance(column, array):
+                arrays[name] = pa.Array.from_buffers(types[column.typecode], len(column), [None, pa.py_buffer(column)])
+            elif self.columns[name] == STR:
+                arrays[name] = pa.array(column, type=pa.string())
+            else:
+                arrays[name] = pa.array(column)
+        return pa.table(arrays)
+
+
+def _batch_types(cls: type = ColumnBatch) -> dict[str, type]:
+    # stored batches are restored by type name
+    types = {cls.__name__: cls}
+    for sub in cls.__subclasses__():
+        types.update(_batch_types(sub))
+    return types
+
+
+class TransferBatch(ColumnBatch):
+    columns = {
+        "block_id": "q",
+        "trans_id": STR,
+        "block_time": "q",
+        "time": STR,
+        "activity_type": STR,
+        "from_address": STR,
+        "to_address": STR,
+        "token_address": STR,
+        "token_decimals": "B",
+        "amount": "Q",
+        "flow": STR,
+    }
+
+
+class BalanceChangeBatch(ColumnBatch):
+    columns = {
+        "block_id": "q",
+        "block_time": "q",
+        "time": STR,
+        "trans_id": STR,
+        "address": STR,
+        "token_address": STR,
+        "token_account": STR,
+        "token_decimals": "B",
+        "amount": "Q",
+        "pre_balance": "Q",
+        "post_balance": "Q",
+        "change_type": STR,
+        "fee": "Q",
+    }
+
+
+class DefiActivityBatch(ColumnBatch):
+    columns = {
+        "block_id": "q",
+        "trans_id": STR,
+        "block_time": "q",
+        "time": STR,
+        "activity_type": STR,
+        "from_address": STR,
+        "to_address": STR,
+        "sources": OBJ,
+        "platform": STR,
+        "routers": OBJ,
+    }
@@ -0,0 +1,136 @@
+"""
+Response decoders for the Solscan client.
+
+Every Solscan response is an envelope `{"success": true, "data": ...}` and Client.get only
+needs `data`. A Decoder turns the raw response bytes into that `data`. The fastest
+available library is used by default: msgspec, then orjson, then the standard library.
+
+MsgspecDecoder can also decode typed: given a schema per endpoint path, it validates the
+payload directly into msgspec Structs generated from the client's TypedDicts, without ever
+building the intermediate dicts.
+
+Example:
+    client = Client(auth_token="...", decoder=MsgspecDecoder(schemas=endpoint_schemas))
+    tx = await client.tx_detail(sig)
+    tx.block_time
+
+Classes:
+    Decoder: Base class for decoders
+    JsonDecoder: Standard library decoder
+    OrjsonDecoder: orjson decoder
+    MsgspecDecoder: msgspec decoder, optionally typed
+"""
+
+
+import enum
+import json
+import types
+import typing
+from typing import Any
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class Decoder:
+    """Base class for decoders."""
+
+    def decode(self, content: bytes, path: str) -> Any:
+        """Returns the `data` field of the response envelope of `path`."""
+        raise NotImplementedError
+
+
+class JsonDecoder(Decoder):
+    def decode(self, content: bytes, path: str) -> Any:
+        return json.loads(content)["data"]
+
+
+class OrjsonDecoder(Decoder):
+    def __init__(self):
+        if orjson is None:
+            raise Exception("OrjsonDecoder requires orjson, install it with: pip install orjson")
+
+    def decode(self, content: bytes, path: str) -> Any:
+        return orjson.loads(content)["data"]
+
+
+def _is_typeddict(tp: Any) -> bool:
+    return isinstance(tp, type) and issubclass(tp, dict) and hasattr(tp, "__annotations__")
+
+
+def struct_type(tp: Any, structs: dict[str, type] = None) -> Any:
+    """Converts a TypedDict based annotation to a msgspec friendly one.
+
+    TypedDicts become Structs with every field optional, so fields missing from a response
+    decode as None, and Enums become their string values, so unknown members do not fail.
+    """
+    structs = {} if structs is None else structs
+    if _is_typeddict(tp):
+        if tp.__name__ not in structs:
+            fields = [(name, struct_type(field, structs) | None, None) for name, field in typing.get_type_hints(tp).items()]
+            structs[tp.__name__] = msgspec.defstruct(tp.__name__, fields, kw_only=True)
+        return structs[tp.__name__]
+    if isinstance(tp, type) and issubclass(tp, enum.Enum):
+        return str
+    origin = typing.get_origin(tp)
+    if origin in (list, typing.List):
+        return list[struct_type(typing.get_args(tp)[0], structs)]
+    if origin in (tuple, typing.Tuple):
+        return tuple[tuple(struct_type(arg, structs) for arg in typing.get_args(tp))]
+    if origin in (typing.Union, types.UnionType):
+        converted = [struct_type(arg, structs) for arg in typing.get_args(tp)]
+        union = converted[0]
+        for arg in converted[1:]:
+            union = union | arg
+        return union
+    return tp
+
+
+class MsgspecDecoder(Decoder):
+    """Decoder backed by msgspec.
+
+    Only the `data` field of the envelope is decoded, other fields are skipped without
+    being materialized.
+
+    Args:
+        schemas (dict[str, Any], optional): Type of `data` per endpoint path, written with the
+            client's TypedDicts. Responses of these paths decode into generated Structs.
+            Other paths decode into plain dicts and lists. Defaults to None.
+    """
+
+    def __init__(self, *, schemas: dict[str, Any] = None):
+        if msgspec is None:
+            raise Exception("MsgspecDecoder requires msgspec, install it with: pip install msgspec")
+        self._untyped = msgspec.json.Decoder(msgspec.defstruct("Envelope", [("data", Any)]))
+        self._typed: dict[str, msgspec.json.Decoder] = {}
+        structs = {}
+        for path, schema in (schemas or {}).items():
+            envelope = msgspec.defstruct(f"Envelope{len(self._typed)}", [("data", struct_type(schema, structs))])
+            self._typed[path] = msgspec.json.Decoder(envelope, strict=False)
+
+    def decode(self, content: bytes, path: str) -> Any:
+        return self._typed.get(path, self._untyped).decode(content).data
+
+
+def _field(record: Any, name: str, default: Any = None) -> Any:
+    # internal paths read records that are dicts, or Structs when decoded with schemas
+    if isinstance(record, dict):
+        return record.get(name, default)
+    return getattr(record, name, default)
+
+
+def default_decoder() -> Decoder:
+    """Returns the fastest untyped decoder available."""
+    if msgspec is not None:
+        return MsgspecDecoder()
+    if orjson is not None:
+        return OrjsonDecoder()
+    return JsonDecoder()
@@ -0,0 +1,177 @@
+"""
+Pool of Solscan API keys sharing the work of one client.
+
+Every key has its own rate limiter and usage counters. Requests go to the least loaded
+key, and keys answering 401 or 429 are put on cooldown, so throughput grows with the
+number of keys. A 403 means the plan does not include the endpoint, which is no reason to
+stop using the key for the others. When every key is at its limit, a request sleeps until the first one has
+room again, and the waits are logged as one summary per interval rather than one line each.
+
+Classes:
+    ApiKey: One auth token with its limiter and usage accounting
+    KeyPool: Picks keys for requests and cools down failing ones
+"""
+
+
+import asyncio
+import hashlib
+import time
+from typing import List, TypedDict
+
+from loguru import logger
+
+from .ratelimit import MemoryWindowStore, WindowStore
+
+
+KeyStats = TypedDict("KeyStats", {
+    "key": str,
+    "requests": int,
+    "errors": int,
+    "in_flight": int,
+    "cooling_down": bool
+})
+
+# Seconds a key rests after answering with these status codes
+default_cooldowns = {401: 3600, 429: 60}
+
+# Seconds the only key of a pool rests after a 429 without Retry-After, the retry backoff does the rest
+single_key_cooldown = 1
+
+
+class ApiKey:
+    """One auth token with its own limiter and usage counters.
+
+    Args:
+        token (str): Decrypted auth token.
+        max_requests_per_minute (int): Quota of the key. The limiter keeps 10 requests of headroom.
+        store (WindowStore, optional): Store holding the window of the key for every process
+            using it. Defaults to None, a MemoryWindowStore private to this process.
+    """
+
+    def __init__(self, token: str, max_requests_per_minute: int, *, store: WindowStore = None):
+        self.token = token
+        self.headers = {"content-type": "application/json", "token": token}
+        self.max_requests_per_minute = max(1, max_requests_per_minute - 10)
+        self.store = store or MemoryWindowStore()
+        # shared stores see a digest, never the token itself
+        self.store_key = hashlib.sha256(token.encode()).hexdigest()[:32]
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+
+    @property
+    def name(self) -> str:
+        return f"...{self.token[-4:]}"
+
+    def cooling_down(self) -> bool:
+        return time.monotonic() < self.cooldown_until
+
+    async def try_acquire(self) -> float:
+        """Takes one request of quota. Returns 0 on success, else seconds to wait before trying again."""
+        return await self.store.acquire(self.store_key, self.max_requests_per_minute, 60)
+
+    def load(self) -> tuple[float, float]:
+        """In-flight requests, then requests sent, relative to the quota of the key."""
+        return self.in_flight / self.max_requests_per_minute, self.requests / self.max_requests_per_minute
+
+
+class KeyPool:
+    """Hands out keys for requests.
+
+    Args:
+        keys (List[ApiKey]): Keys to use, at least one.
+        cooldowns (dict[int, float], optional): Seconds of rest per status code. Defaults to default_cooldowns.
+        log_interval (float, optional): Seconds between summaries of the requests that waited for a key. Defaults to 10.
+    """
+
+    def __init__(self, keys: List[ApiKey], *, cooldowns: dict[int, float] = None, log_interval: float = 10):
+        if not keys:
+            raise Exception("Key pool needs at least one key")
+        self.keys = keys
+        self._cooldowns = default_cooldowns if cooldowns is None else cooldowns
+        self.log_interval = log_interval
+        self.waits = 0
+        self.waited = 0.0
+        self._logged = (time.monotonic(), 0, 0.0, 0.0)
+
+    @property
+    def max_requests_per_minute(self) -> int:
+        return sum(key.max_requests_per_minute for key in self.keys)
+
+    def available(self) -> List[ApiKey]:
+        """Keys not cooling down, least loaded first."""
+        return sorted((key for key in self.keys if not key.cooling_down()), key=ApiKey.load)
+
+    async def acquire(self) -> ApiKey:
+        """Waits for a key with free quota, marks a request in flight on it and returns it.
+
+        While no key has room, sleeps until the first one will, as told by its window store.
+        """
+        started = None
+        while True:
+            keys = self.available()
+            if not keys:
+                wait = min(key.cooldown_until for key in self.keys) - time.monotonic()
+                logger.error(f"Solscan client all {len(self.keys)} keys cooling down, waiting {wait:.1f} seconds")
+            else:
+                waits = []
+                for key in keys:
+                    wait = await key.try_acquire()
+                    if wait == 0:
+                        key.requests += 1
+                        key.in_flight += 1
+                        if started is not None:
+                            self._waited(time.monotonic() - started)
+                        return key
+                    waits.append(wait)
+                wait = min(waits)
+            if started is None:
+                started = time.monotonic()
+            await asyncio.sleep(max(0.001, wait))
+
+    def _waited(self, seconds: float):
+        self.waits += 1
+        self.waited += seconds
+        at, waits, waited, longest = self._logged
+        longest = max(longest, seconds)
+        now = time.monotonic()
+        if now - at < self.log_interval:
+            self._logged = (at, waits, waited, longest)
+            return
+        count = self.waits - waits
+        logger.warning(f"Solscan client {count} requests waited for a key with free quota in the last {now - at:.0f} seconds, "
+                       f"{(self.waited - waited) / count:.2f} seconds on average, {longest:.2f} at most")
+        self._logged = (now, self.waits, self.waited, 0.0)
+
+    def release(self, key: ApiKey, status_code: int = None, retry_after: float = None):
+        """Ends a request of `key`, cooling it down if `status_code` calls for it, for `retry_after` seconds if given.
+
+        A key answering 401 is only put aside while another key is usable. Otherwise the
+        request fails with the 401 instead of every request waiting for the cooldown.
+        """
+        key.in_flight -= 1
+        cooldown = self._cooldowns.get(status_code)
+        if cooldown and status_code == 401 and not any(other is not key for other in self.available()):
+            cooldown = None
+        if cooldown:
+            if retry_after is not None:
+                cooldown = retry_after
+            elif len(self.keys) == 1:
+                cooldown = min(cooldown, single_key_cooldown)
+            key.errors += 1
+            key.cooldown_until = time.monotonic() + cooldown
+            logger.error(f"Solscan key {key.name} answered {status_code}, cooling down for {cooldown} seconds")
+
+    def can_retry(self, key: ApiKey, status_code: int) -> bool:
+        """Whether a request `key` answered with `status_code` may be retried on another key."""
+        return status_code in self._cooldowns and any(other is not key for other in self.available())
+
+    def stats(self) -> List[KeyStats]:
+        return [{
+            "key": key.name,
+            "requests": key.requests,
+            "errors": key.errors,
+            "in_flight": key.in_flight,
+            "cooling_down": key.cooling_down(),
+        } for key in self.keys]
@@ -0,0 +1,345 @@
+"""
+Instrumentation of the requests of a client.
+
+Client.get reports every call to a list of Hooks: when it starts, every attempt sent to
+the API with its status, latency, response size and the time it waited for the rate
+limiter, when it finishes, and every cache lookup. The Client always records them in a
+Metrics, which keeps per-endpoint counters and histograms and renders them in the
+Prometheus text format. SpanHooks reports calls as spans to an OpenTelemetry tracer.
+Other hooks, e.g. to a StatsD client, subclass Hooks.
+
+Example:
+    client = Client(auth_token="...", hooks=[SpanHooks(trace.get_tracer("py3s"))])
+    await client.massive_account_transfers(address, total_size=100_000)
+    print(client.metrics()["endpoints"])
+    print(client.prometheus_metrics())
+
+Classes:
+    RequestTrace: One call of Client.get, as seen by hooks
+    Hooks: Base class for receivers of request events
+    Metrics: Per-endpoint counters and histograms, with Prometheus text exposition
+    SpanHooks: Reports calls as spans to an OpenTelemetry tracer
+"""
+
+
+import asyncio
+import bisect
+import time
+from typing import Any, List, TypedDict
+
+
+EndpointMetrics = TypedDict("EndpointMetrics", {
+    "endpoint": str,
+    "requests": int,
+    "errors": int,
+    "attempts": int,
+    "retries": int,
+    "throttled": int,
+    "bytes": int,
+    "cache_hits": int,
+    "cache_misses": int,
+    "cache_hit_ratio": float | None,
+    "latency_p50": float | None,
+    "latency_p95": float | None,
+    "latency_p99": float | None,
+    "limiter_wait_seconds": float,
+    "limiter_wait_p99": float | None
+})
+
+MetricsSnapshot = TypedDict("MetricsSnapshot", {
+    "in_flight": int,
+    "waiting": int,
+    "endpoints": List[EndpointMetrics]
+})
+
+# Upper bounds, in seconds, of the buckets of latency and limiter wait histograms
+default_buckets = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10, 30, 60)
+
+
+class RequestTrace:
+    """One call of Client.get that was not answered by the cache, retries included.
+
+    Attributes:
+        endpoint (str): Path of the endpoint, e.g. "/account/transfer"
+        url (str): Full URL with query
+        priority (str): Scheduling priority of the call
+        started (float): time.monotonic() at the start
+        attempts (int): Requests sent so far
+        status (int | None): Status of the last response, None before any or after a transport error
+        error (BaseException | None): Exception the call ended with
+        bytes (int): Response bytes received over all attempts
+        limiter_wait (float): Seconds spent waiting for the scheduler, the pacer and a key, over all attempts
+        duration (float | None): Seconds the call took, once finished
+    """
+
+    def __init__(self, endpoint: str, url: str, priority: str):
+        self.endpoint = endpoint
+        self.url = url
+        self.priority = priority
+        self.started = time.monotonic()
+        self.attempts = 0
+        self.status: int | None = None
+        self.error: BaseException | None = None
+        self.bytes = 0
+        self.limiter_wait = 0.0
+        self.duration: float | None = None
+
+
+class Hooks:
+    """Base class for receivers of request events. Every method does nothing by default.
+
+    Hooks are called on the event loop thread and must not block.
+    """
+
+    def started(self, trace: RequestTrace):
+        """A call is about to wait for the rate limiter."""
+
+    def sent(self, trace: RequestTrace):
+        """A request of the call got through the rate limiter and is being sent."""
+
+    def attempted(self, trace: RequestTrace, status: int | None, latency: float, size: int, wait: float, error: BaseException | None):
+        """A request of the call came back with `status`, or failed with `error`, after `latency` seconds.
+
+        `wait` is the time this attempt waited for the rate limiter, `size` the response bytes.
+        """
+
+    def finished(self, trace: RequestTrace):
+        """A call returned or raised, see trace.error."""
+
+    def cache_lookup(self, endpoint: str, hit: bool):
+        """The response cache was asked for a call to `endpoint`."""
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """Estimates the `q` quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                if i == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class _EndpointMetrics:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.requests: dict[str, int] = {}
+        self.responses: dict[str, int] = {}
+        self.retries = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.latency = _Histogram(buckets)
+        self.limiter_wait = _Histogram(buckets)
+
+
+def _status_label(status: int | None) -> str:
+    return "error" if status is None else str(status)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics(Hooks):
+    """Per-endpoint counters and histograms of the calls of a client.
+
+    Latency is measured per attempt, from sending the request to having its body.
+    Quantiles are estimated from histogram buckets.
+
+    Args:
+        buckets (tuple[float, ...], optional): Bucket upper bounds in seconds. Defaults to default_buckets.
+        prefix (str, optional): Prefix of the Prometheus metric names. Defaults to "py3s_".
+    """
+
+    def __init__(self, *, buckets: tuple[float, ...] = default_buckets, prefix: str = "py3s_"):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self.in_flight = 0
+        self.waiting = 0
+        self._endpoints: dict[str, _EndpointMetrics] = {}
+        self._sending: set[int] = set()
+
+    def _endpoint(self, endpoint: str) -> _EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = _EndpointMetrics(self.buckets)
+        return metrics
+
+    def started(self, trace: RequestTrace):
+        self.waiting += 1
+
+    def sent(self, trace: RequestTrace):
+        self.waiting -= 1
+        self.in_flight += 1
+        self._sending.add(id(trace))
+
+    def attempted(self, trace: RequestTrace, status: int | None, latency: float, size: int, wait: float, error: BaseException | None):
+        # the call waits for the limiter again if it is retried, and stops waiting when it finishes
+        self._sending.discard(id(trace))
+        self.in_flight -= 1
+        self.waiting += 1
+        metrics = self._endpoint(trace.endpoint)
+        label = _status_label(status)
+        metrics.responses[label] = metrics.responses.get(label, 0) + 1
+        if trace.attempts > 1:
+            metrics.retries += 1
+        metrics.bytes += size
+        metrics.latency.observe(latency)
+        metrics.limiter_wait.observe(wait)
+
+    def finished(self, trace: RequestTrace):
+        # a call cancelled while its request was on the wire had no attempt reported
+        if id(trace) in self._sending:
+            self._sending.discard(id(trace))
+            self.in_flight -= 1
+        else:
+            self.waiting -= 1
+        metrics = self._endpoint(trace.endpoint)
+        label = "cancelled" if isinstance(trace.error, asyncio.CancelledError) else _status_label(trace.status)
+        metrics.requests[label] = metrics.requests.get(label, 0) + 1
+
+    def cache_lookup(self, endpoint: str, hit: bool):
+        metrics = self._endpoint(endpoint)
+        if hit:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+
+    def snapshot(self) -> MetricsSnapshot:
+        endpoints = []
+        for endpoint, metrics in sorted(self._endpoints.items()):
+            lookups = metrics.cache_hits + metrics.cache_misses
+            endpoints.append({
+                "endpoint": endpoint,
+                "requests": sum(metrics.requests.values()),
+                "errors": sum(count for label, count in metrics.requests.items() if label != "200"),
+                "attempts": sum(metrics.responses.values()),
+                "retries": metrics.retries,
+                "throttled": metrics.responses.get("429", 0),
+                "bytes": metrics.bytes,
+                "cache_hits": metrics.cache_hits,
+                "cache_misses": metrics.cache_misses,
+                "cache_hit_ratio": metrics.cache_hits / lookups if lookups else None,
+                "latency_p50": metrics.latency.quantile(0.5),
+                "latency_p95": metrics.latency.quantile(0.95),
+                "latency_p99": metrics.latency.quantile(0.99),
+                "limiter_wait_seconds": metrics.limiter_wait.sum,
+                "limiter_wait_p99": metrics.limiter_wait.quantile(0.99),
+            })
+        return {"in_flight": self.in_flight, "waiting": self.waiting, "endpoints": endpoints}
+
+    def prometheus(self) -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        p = self.prefix
+        lines = []
+
+        def family(name: str, kind: str, help: str):
+            lines.append(f"# HELP {p}{name} {help}")
+            lines.append(f"# TYPE {p}{name} {kind}")
+
+        def labeled(counts_of: str, label: str, name: str):
+            for endpoint, metrics in sorted(self._endpoints.items()):
+                for value, count in sorted(getattr(metrics, counts_of).items()):
+                    lines.append(f'{p}{name}{{endpoint="{_escape(endpoint)}",{label}="{value}"}} {count}')
+
+        def per_endpoint(name: str, value_of: Any):
+            for endpoint, metrics in sorted(self._endpoints.items()):
+                lines.append(f'{p}{name}{{endpoint="{_escape(endpoint)}"}} {value_of(metrics)}')
+
+        def histogram(name: str, histogram_of: Any):
+            for endpoint, metrics in sorted(self._endpoints.items()):
+                histogram: _Histogram = histogram_of(metrics)
+                labels = f'endpoint="{_escape(endpoint)}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{p}{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{p}{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{p}{name}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{p}{name}_count{{{labels}}} {histogram.count}")
+
+        family("requests_total", "counter", "Calls to the Solscan API by final status, retries not counted.")
+        labeled("requests", "status", "requests_total")
+        family("responses_total", "counter", "Responses of the Solscan API by status, retries included.")
+        labeled("responses", "status", "responses_total")
+        family("retries_total", "counter", "Requests sent again after a failed attempt.")
+        per_endpoint("retries_total", lambda m: m.retries)
+        family("response_bytes_total", "counter", "Response body bytes received.")
+        per_endpoint("response_bytes_total", lambda m: m.bytes)
+        family("cache_lookups_total", "counter", "Response cache lookups by result.")
+        for endpoint, metrics in sorted(self._endpoints.items()):
+            lines.append(f'{p}cache_lookups_total{{endpoint="{_escape(endpoint)}",result="hit"}} {metrics.cache_hits}')
+            lines.append(f'{p}cache_lookups_total{{endpoint="{_escape(endpoint)}",result="miss"}} {metrics.cache_misses}')
+        family("request_duration_seconds", "histogram", "Time from sending a request to having its body.")
+        histogram("request_duration_seconds", lambda m: m.latency)
+        family("limiter_wait_seconds", "histogram", "Time an attempt waited for the scheduler, the pacer and a key.")
+        histogram("limiter_wait_seconds", lambda m: m.limiter_wait)
+        family("in_flight_requests", "gauge", "Requests sent and not answered yet.")
+        lines.append(f"{p}in_flight_requests {self.in_flight}")
+        family("waiting_requests", "gauge", "Calls waiting for the rate limiter.")
+        lines.append(f"{p}waiting_requests {self.waiting}")
+        return "\n".join(lines) + "\n"
+
+
+class SpanHooks(Hooks):
+    """Reports every call as a span of an OpenTelemetry tracer, with one event per attempt.
+
+    Spans are started with the current context, so they nest under the caller's span.
+
+    Args:
+        tracer (Any): An `opentelemetry.trace.Tracer`, or any object with a compatible `start_span`.
+    """
+
+    def __init__(self, tracer: Any):
+        self._tracer = tracer
+        self._spans: dict[int, Any] = {}
+
+    def started(self, trace: RequestTrace):
+        self._spans[id(trace)] = self._tracer.start_span(f"GET {trace.endpoint}", attributes={
+            "http.request.method": "GET",
+            "url.full": trace.url,
+            "py3s.priority": trace.priority,
+        })
+
+    def attempted(self, trace: RequestTrace, status: int | None, latency: float, size: int, wait: float, error: BaseException | None):
+        span = self._spans.get(id(trace))
+        if span is None:
+            return
+        attributes = {"py3s.attempt": trace.attempts, "py3s.latency": latency, "py3s.limiter_wait": wait, "py3s.bytes": size}
+        if status is not None:
+            attributes["http.response.status_code"] = status
+        if error is not None:
+            attributes["error.type"] = type(error).__name__
+        span.add_event("attempt", attributes)
+
+    def finished(self, trace: RequestTrace):
+        span = self._spans.pop(id(trace), None)
+        if span is None:
+            return
+        if trace.status is not None:
+            span.set_attribute("http.response.status_code", trace.status)
+        span.set_attribute("py3s.attempts", trace.attempts)
+        span.set_attribute("py3s.limiter_wait", trace.limiter_wait)
+        if trace.error is not None:
+            span.set_attribute("error.type", type(trace.error).__name__)
+            if hasattr(span, "record_exception"):
+                span.record_exception(trace.error)
+        span.end()
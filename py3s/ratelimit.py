@@ -0,0 +1,351 @@
+"""
+Rate limiting primitives for the Solscan client.
+
+A Solscan key's quota is shared by every process using it. The default MemoryWindowStore
+of a Client only sees its own requests, so several workers on one key overrun the quota. A
+WindowStore keeps the sliding window of a key where all workers can see it: in a SQLite
+file for processes on one host, or in Redis, or any server speaking its protocol and
+scripting, for processes on several hosts.
+
+Stores answer a refused request with the exact time until the window has room, so
+waiting requests sleep until then instead of polling.
+
+Example:
+    client = Client(auth_token="...", limiter_store=SQLiteWindowStore("/tmp/solscan-limit.sqlite"))
+
+The rate the client paces requests at is steered by a RateController: it halves on 429
+and 5xx responses, pauses for Retry-After, grows back linearly on success, and stretches
+the remaining compute units reported by the usage endpoint.
+
+Classes:
+    TokenBucket: Awaitable token bucket that paces requests at a steady rate
+    RateController: Adapts the rate of a TokenBucket to the responses it sees
+    WindowStore: Base class for sliding window stores
+    MemoryWindowStore: Window store private to one process
+    SQLiteWindowStore: Window store shared by processes on one host
+    RedisWindowStore: Window store shared by processes on several hosts
+"""
+
+
+import asyncio
+import collections
+import email.utils
+import inspect
+import time
+import uuid
+from typing import Any, TypedDict
+
+from loguru import logger
+
+from .sqlitedb import SQLiteDatabase
+
+
+RateStats = TypedDict("RateStats", {
+    "requests_per_minute": float,
+    "ceiling_per_minute": float,
+    "decreases": int,
+    "paused_seconds": float,
+    "remaining_cus": int | None
+})
+
+
+class TokenBucket:
+    """Awaitable token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. Waiters are served
+    in FIFO order and sleep with asyncio until their token is due, so pacing never blocks
+    the event loop and requests leave at a flat rate instead of in bursts.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float, optional): Maximum tokens that can accumulate while idle. Defaults to 1.
+
+    Example:
+        bucket = TokenBucket(990 / 60)
+        await bucket.acquire()
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        if rate <= 0:
+            raise Exception("Token bucket rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause(self, seconds: float):
+        """Hands out no tokens for the next `seconds`."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def paused_for(self) -> float:
+        return max(0.0, self._paused_until - time.monotonic())
+
+    async def acquire(self, tokens: float = 1):
+        async with self._lock:
+            while True:
+                if self.paused_for() > 0:
+                    await asyncio.sleep(self.paused_for())
+                    self._tokens = 0
+                    self._updated = time.monotonic()
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+def retry_after(headers: dict[str, str]) -> float | None:
+    """Seconds asked for by a Retry-After header, given as seconds or as an HTTP date."""
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateController:
+    """Adapts the rate of a TokenBucket with additive increase, multiplicative decrease.
+
+    A 429 or 5xx response multiplies the rate by `decrease`, at most once per `hold`
+    seconds, since one overload is usually answered by several failures in a row, and
+    pauses the bucket for as long as a Retry-After header asks. Every success adds back a
+    share of `increase`, so the rate climbs by `increase` per second up to `ceiling`,
+    unless latency has grown to `latency_factor` times its best average, a sign the
+    server is saturating.
+
+    The controller also takes the reports of the usage endpoint. From consecutive reports
+    it learns the compute units a request costs, and caps the rate so the remaining units
+    last until the next report. When none are left it pauses until then.
+
+    Args:
+        bucket (TokenBucket): Bucket whose rate is controlled.
+        ceiling (float): Highest rate, in requests per second, usually the quota.
+        floor (float, optional): Lowest rate. Defaults to 1/20 of the ceiling.
+        increase (float, optional): Rate gained per second of successes. Defaults to 1/30 of the ceiling.
+        decrease (float, optional): Factor applied on overload. Defaults to 0.5.
+        hold (float, optional): Seconds after a decrease during which further failures are ignored. Defaults to 1.
+        latency_factor (float, optional): Latency growth that stops increases. Defaults to 3.
+        usage_interval (float, optional): Seconds between usage reports, None to never ask. Defaults to 300.
+
+    Example:
+        controller = RateController(bucket, ceiling=990 / 60)
+        controller.observe(resp.status_code, latency, resp.headers)
+    """
+
+    def __init__(self, bucket: TokenBucket, ceiling: float, *, floor: float = None, increase: float = None, decrease: float = 0.5,
+                 hold: float = 1, latency_factor: float = 3, usage_interval: float | None = 300):
+        self.bucket = bucket
+        self.ceiling = ceiling
+        self.floor = floor or ceiling / 20
+        self.increase = increase or ceiling / 30
+        self.decrease = decrease
+        self.hold = hold
+        self.latency_factor = latency_factor
+        self.usage_interval = usage_interval
+        self.decreases = 0
+        self.remaining_cus: int | None = None
+        self._limit = ceiling
+        self._held_until = 0.0
+        self._latency: float | None = None
+        self._best_latency: float | None = None
+        self._requests = 0
+        self._usage: tuple[int, int] | None = None
+        self._next_usage = time.monotonic() + usage_interval if usage_interval else None
+
+    def observe(self, status_code: int, latency: float, headers: dict[str, str]):
+        """Feeds the controller one response."""
+        self._requests += 1
+        if status_code == 429 or status_code >= 500:
+            wait = retry_after(headers)
+            if wait:
+                self.bucket.pause(wait)
+            now = time.monotonic()
+            if now >= self._held_until:
+                self._held_until = now + self.hold
+                self.decreases += 1
+                self.bucket.rate = max(self.floor, self.bucket.rate * self.decrease)
+                logger.error(f"Solscan client got {status_code}, rate down to {self.bucket.rate * 60:.0f} per minute")
+            return
+        if status_code != 200:
+            return
+        self._latency = latency if self._latency is None else 0.9 * self._latency + 0.1 * latency
+        self._best_latency = self._latency if self._best_latency is None else min(self._best_latency, self._latency)
+        if self._latency > self._best_latency * self.latency_factor:
+            return
+        self.bucket.rate = min(self._limit, self.bucket.rate + self.increase / self.bucket.rate)
+
+    def usage_due(self) -> bool:
+        """Whether a usage report should be requested now. Claims it, so it is due once per interval."""
+        if self._next_usage is None or time.monotonic() < self._next_usage:
+            return False
+        self._next_usage = time.monotonic() + self.usage_interval
+        return True
+
+    def observe_usage(self, usage: dict[str, Any]):
+        """Feeds the controller a report of the usage endpoint."""
+        remaining = usage.get("remaining_cus")
+        used = usage.get("usage_cus")
+        if remaining is None:
+            return
+        self.remaining_cus = remaining
+        self._limit = self.ceiling
+        if self._usage is not None and used is not None and self.usage_interval:
+            last_used, last_requests = self._usage
+            if used > last_used and self._requests > last_requests:
+                cus_per_request = (used - last_used) / (self._requests - last_requests)
+                self._limit = max(self.floor, min(self.ceiling, remaining / cus_per_request / self.usage_interval))
+                self.bucket.rate = min(self.bucket.rate, self._limit)
+        self._usage = (used or 0, self._requests)
+        if remaining <= 0 and self.usage_interval:
+            logger.error(f"Solscan compute units exhausted, pausing for {self.usage_interval} seconds")
+            self.bucket.pause(self.usage_interval)
+
+    def stats(self) -> RateStats:
+        return {
+            "requests_per_minute": self.bucket.rate * 60,
+            "ceiling_per_minute": self._limit * 60,
+            "decreases": self.decreases,
+            "paused_seconds": self.bucket.paused_for(),
+            "remaining_cus": self.remaining_cus,
+        }
+
+
+class WindowStore:
+    """Base class for sliding window stores.
+
+    A store records the requests of every key and admits a request only if fewer than
+    `limit` were admitted under the same key during the last `window` seconds. The check
+    and the record happen atomically, so concurrent processes never admit more than the limit.
+    """
+
+    async def acquire(self, key: str, limit: int, window: float) -> float:
+        """Records a request under `key` if the window has room.
+
+        Returns:
+            float: 0 if the request was admitted, else seconds until the oldest request leaves the window.
+        """
+        raise NotImplementedError
+
+
+class MemoryWindowStore(WindowStore):
+    """Window store private to this process.
+
+    The admission times of each key are kept in a queue, at most `limit` of them, so a
+    refused request learns exactly when the oldest one leaves the window.
+    """
+
+    def __init__(self):
+        self._windows: dict[str, collections.deque[float]] = {}
+
+    async def acquire(self, key: str, limit: int, window: float) -> float:
+        now = time.monotonic()
+        admitted = self._windows.setdefault(key, collections.deque())
+        while admitted and admitted[0] <= now - window:
+            admitted.popleft()
+        if len(admitted) < limit:
+            admitted.append(now)
+            return 0.0
+        return max(admitted[0] + window - now, 0.001)
+
+
+class SQLiteWindowStore(WindowStore):
+    """Window store in a SQLite file, shared by processes on one host.
+
+    Each acquisition runs in an immediate transaction, which holds the database write
+    lock from the count to the insert.
+
+    Args:
+        path (str): Database file, created if missing.
+    """
+
+    def __init__(self, path: str):
+        self._db = SQLiteDatabase(path, [
+            "CREATE TABLE IF NOT EXISTS requests (key TEXT NOT NULL, at REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS requests_key_at ON requests (key, at)",
+        ])
+
+    def _acquire(self, key: str, limit: int, window: float) -> float:
+        with self._db.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                conn.execute("DELETE FROM requests WHERE key = ? AND at <= ?", (key, now - window))
+                count, oldest = conn.execute("SELECT COUNT(*), MIN(at) FROM requests WHERE key = ?", (key,)).fetchone()
+                if count < limit:
+                    conn.execute("INSERT INTO requests (key, at) VALUES (?, ?)", (key, now))
+                    wait = 0.0
+                else:
+                    wait = max(oldest + window - now, 0.001)
+                conn.execute("COMMIT")
+                return wait
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    async def acquire(self, key: str, limit: int, window: float) -> float:
+        # waiting for the write lock of another process must not block the event loop
+        return await asyncio.to_thread(self._acquire, key, limit, window)
+
+    def close(self):
+        self._db.close()
+
+
+# Keeps the window of a key in a sorted set scored by admission time. The clock of the
+# server is used, so hosts with skewed clocks still share one window.
+_redis_acquire_script = """
+local now = redis.call('TIME')
+local t = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', t - window)
+if redis.call('ZCARD', KEYS[1]) < limit then
+    redis.call('ZADD', KEYS[1], t, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+    return '0'
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return tostring(math.max(tonumber(oldest[2]) + window - t, 0.001))
+"""
+
+
+class RedisWindowStore(WindowStore):
+    """Window store in Redis, shared by processes on several hosts.
+
+    The check and the record run in one Lua script. Any server implementing the Redis
+    protocol with EVAL, such as Valkey, KeyDB or fakeredis, works as well.
+
+    Args:
+        redis (Any): A `redis.Redis` or `redis.asyncio.Redis` client, or a compatible one.
+            Calls of a synchronous client run in a worker thread, so its round trips do not
+            block the event loop.
+        prefix (str, optional): Prefix of the keys written. Defaults to "py3s:limit:".
+    """
+
+    def __init__(self, redis: Any, prefix: str = "py3s:limit:"):
+        self._redis = redis
+        self._prefix = prefix
+        # eval of redis.asyncio clients returns the coroutine of their async execute_command
+        self._async = inspect.iscoroutinefunction(redis.eval) or inspect.iscoroutinefunction(getattr(redis, "execute_command", None))
+
+    async def acquire(self, key: str, limit: int, window: float) -> float:
+        args = (_redis_acquire_script, 1, self._prefix + key, limit, window, uuid.uuid4().hex)
+        if self._async:
+            result = await self._redis.eval(*args)
+        else:
+            result = await asyncio.to_thread(self._redis.eval, *args)
+            if inspect.isawaitable(result):
+                result = await result
+        return float(result)
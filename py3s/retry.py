@@ -0,0 +1,117 @@
+"""
+Retry policy of the Solscan client.
+
+Client._fetch retries transport errors, timeouts, 429 and 5xx responses. Each retry waits an
+exponentially growing, jittered delay, or the server's Retry-After if longer, and then
+queues for the rate limiter again like any new request. Retries are bounded by a number of
+attempts and by a deadline per call. They are also bounded by a retry budget: a bucket that
+earns a fraction of a retry per original request and a few per second, so during an outage
+retries can only take a small share of the quota.
+
+Calls made with `_must=True`, as massive crawls do, are not limited in attempts or by the
+deadline, only by Client.deadline() if one is set. When the budget is empty they wait for
+it to refill instead of failing.
+
+Example:
+    client = Client(auth_token="...", retry_policy=RetryPolicy(max_attempts=8, deadline=120))
+
+Classes:
+    RetryPolicy: Backoff, retryable statuses, attempt limits and retry budget
+"""
+
+
+import asyncio
+import random
+import time
+from typing import TypedDict
+
+
+RetryStats = TypedDict("RetryStats", {
+    "requests": int,
+    "retries": int,
+    "budget_exhausted": int,
+    "budget": float
+})
+
+default_retry_statuses = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is sent again.
+
+    Args:
+        max_attempts (int, optional): Attempts per call, first one included. Defaults to 5.
+        deadline (float, optional): Seconds a call without `_must` may take, retries included, None for no limit. Defaults to 60.
+        base_delay (float, optional): Delay cap of the first retry, doubled for every further one. Defaults to 0.5.
+        max_delay (float, optional): Highest delay cap. Defaults to 30.
+        retry_statuses (tuple[int, ...], optional): Status codes worth retrying. Defaults to 429 and 5xx.
+        budget_ratio (float, optional): Retries earned per original request. Defaults to 0.2.
+        budget_per_second (float, optional): Retries earned per second regardless of traffic. Defaults to 1.
+        budget_cap (float, optional): Most retries the budget can hold. Defaults to 50.
+    """
+
+    def __init__(self, *, max_attempts: int = 5, deadline: float | None = 60, base_delay: float = 0.5, max_delay: float = 30,
+                 retry_statuses: tuple[int, ...] = default_retry_statuses,
+                 budget_ratio: float = 0.2, budget_per_second: float = 1, budget_cap: float = 50):
+        self.max_attempts = max(1, max_attempts)
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+        self.budget_ratio = budget_ratio
+        self.budget_per_second = budget_per_second
+        self.budget_cap = budget_cap
+        self._budget = budget_cap
+        self._updated = time.monotonic()
+        self.requests = 0
+        self.retries = 0
+        self.budget_exhausted = 0
+
+    def retryable(self, status_code: int | None) -> bool:
+        """Whether a response with `status_code`, or a transport error when None, may be retried."""
+        return status_code is None or status_code in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait before retry number `attempt`, with full jitter, and at least `retry_after`."""
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return max(random.uniform(0, cap), retry_after or 0)
+
+    def give_up(self, attempt: int, delay: float, must: bool, remaining: float | None) -> bool:
+        """Whether a call stops before retry number `attempt`, `remaining` seconds before its deadline."""
+        if remaining is not None and delay >= remaining:
+            return True
+        return not must and attempt >= self.max_attempts
+
+    def _refill(self):
+        now = time.monotonic()
+        self._budget = min(self.budget_cap, self._budget + (now - self._updated) * self.budget_per_second)
+        self._updated = now
+
+    def record_request(self):
+        """Counts an original request, which earns part of a retry."""
+        self.requests += 1
+        self._refill()
+        self._budget = min(self.budget_cap, self._budget + self.budget_ratio)
+
+    async def spend(self, must: bool) -> bool:
+        """Takes one retry from the budget. Waits for it to refill if `must`, else returns False when empty."""
+        self._refill()
+        if self._budget < 1:
+            self.budget_exhausted += 1
+            if not must or self.budget_per_second <= 0:
+                return False
+            while self._budget < 1:
+                await asyncio.sleep((1 - self._budget) / self.budget_per_second)
+                self._refill()
+        self._budget -= 1
+        self.retries += 1
+        return True
+
+    def stats(self) -> RetryStats:
+        self._refill()
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "budget_exhausted": self.budget_exhausted,
+            "budget": self._budget,
+        }
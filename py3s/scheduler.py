@@ -0,0 +1,128 @@
+"""
+Scheduling of the requests of one client.
+
+Every request waits for the client's pacer and for a key with free quota. While a massive
+crawl keeps hundreds of page requests waiting there, a request made on behalf of a user
+would wait behind all of them. A Scheduler sits in front of the limiter and decides which
+waiting request goes next: requests of a higher Priority always go first, and requests of
+one priority are shared between tenants by weighted fair queuing. A tenant with weight 2
+gets twice the requests of a tenant with weight 1 while both have requests waiting, and a
+tenant's single request is never queued behind another tenant's backlog.
+
+Requests take their priority and tenant from Client.priority(). Calls made with
+`_must=True`, as massive crawls and syncs do, default to BULK, the others to NORMAL.
+
+Example:
+    with client.priority(Priority.INTERACTIVE, tenant="api"):
+        tx = await client.tx_detail(sig)
+
+Classes:
+    Priority: Request classes, served in order
+    Scheduler: Priority and weighted fair queue in front of the rate limiter
+"""
+
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from enum import Enum
+from typing import AsyncIterator, List, TypedDict
+
+
+class Priority(Enum):
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+SchedulerStats = TypedDict("SchedulerStats", {
+    "priority": str,
+    "waiting": int,
+    "served": int,
+    "max_wait": float
+})
+
+
+class Scheduler:
+    """Hands the turn to go through the rate limiter to one request at a time.
+
+    Waiting requests are served by priority, then by the virtual finish time of self-clocked
+    fair queuing: a request of a tenant is tagged `1 / weight` after the later of the
+    tenant's previous tag and the tag of the request last served, and the lowest tag goes
+    first. Lower priorities only go when no higher one is waiting, so a request of the
+    highest priority waits for at most the request holding the turn and its own peers.
+
+    Args:
+        weights (dict[str, float], optional): Weight of each tenant. Tenants not listed, and requests without a tenant, weigh 1. Defaults to None.
+    """
+
+    def __init__(self, weights: dict[str, float] = None):
+        self.weights = dict(weights or {})
+        self._busy = False
+        self._order = itertools.count()
+        self._waiting: dict[Priority, list[tuple[float, int, float, asyncio.Future]]] = {p: [] for p in Priority}
+        self._virtual = {p: 0.0 for p in Priority}
+        self._tags: dict[tuple[Priority, str | None], float] = {}
+        self._served = {p: 0 for p in Priority}
+        self._max_wait = {p: 0.0 for p in Priority}
+
+    def _tag(self, priority: Priority, tenant: str | None) -> float:
+        if len(self._tags) > 1000:
+            # tags at or behind the virtual time carry no information any more
+            self._tags = {k: v for k, v in self._tags.items() if v > self._virtual[k[0]]}
+        tag = max(self._virtual[priority], self._tags.get((priority, tenant), 0.0)) + 1 / self.weights.get(tenant, 1)
+        self._tags[(priority, tenant)] = tag
+        return tag
+
+    def _serve(self, priority: Priority, tag: float, since: float):
+        self._virtual[priority] = tag
+        self._served[priority] += 1
+        self._max_wait[priority] = max(self._max_wait[priority], time.monotonic() - since)
+
+    @contextlib.asynccontextmanager
+    async def turn(self, priority: Priority, tenant: str = None) -> AsyncIterator[None]:
+        """Waits for the turn of a request of `tenant` at `priority`, and holds it for the block."""
+        await self._acquire(priority, tenant)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Priority, tenant: str | None):
+        tag = self._tag(priority, tenant)
+        since = time.monotonic()
+        if not self._busy:
+            self._busy = True
+            self._serve(priority, tag, since)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting[priority], (tag, next(self._order), since, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # the turn may have been handed over just before the cancellation arrived
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        for priority in Priority:
+            waiting = self._waiting[priority]
+            while waiting:
+                tag, _, since, future = heapq.heappop(waiting)
+                if future.done():
+                    continue
+                self._serve(priority, tag, since)
+                future.set_result(None)
+                return
+        self._busy = False
+
+    def stats(self) -> List[SchedulerStats]:
+        return [{
+            "priority": priority.name.lower(),
+            "waiting": sum(not future.done() for *_, future in self._waiting[priority]),
+            "served": self._served[priority],
+            "max_wait": self._max_wait[priority],
+        } for priority in Priority]
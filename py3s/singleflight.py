@@ -0,0 +1,87 @@
+"""
+In-flight request coalescing for the Solscan client.
+
+When several coroutines ask for the same URL at the same moment, only the first one sends
+a request. The others wait for it and receive the same result or exception.
+"""
+
+
+import asyncio
+from typing import Awaitable, Callable, TypeVar, TypedDict
+
+
+D = TypeVar("D")
+
+SingleflightStats = TypedDict("SingleflightStats", {
+    "calls": int,
+    "shared": int,
+    "in_flight": int
+})
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task, deadline: float | None):
+        self.task = task
+        self.deadline = deadline
+        self.waiters = 0
+
+
+class Singleflight:
+    """Runs at most one call per key at a time.
+
+    The call runs in its own task, so a caller that is cancelled does not cancel it for
+    the others. It is only cancelled once every waiting caller has gone away, and the last
+    caller waits for it to wind down, so the connection and key it held are released by
+    the time that caller's cancellation propagates.
+
+    Callers may give the event loop time by which they stop waiting. A call's deadline is
+    the latest of its callers', or None once a caller without one joined, so a call that
+    bounds its own work by deadline() never gives up before its most patient caller.
+
+    Args:
+        cancel_wait (float, optional): Longest wait in seconds for a cancelled call to wind down. Defaults to 1.
+
+    Attributes:
+        calls (int): Calls actually started
+        shared (int): Calls saved because an identical call was already in flight
+    """
+
+    def __init__(self, *, cancel_wait: float = 1):
+        self.cancel_wait = cancel_wait
+        self._calls: dict[str, _Call] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[D]], *, deadline: float = None) -> D:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()), deadline)
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.calls += 1
+        else:
+            self.shared += 1
+            if call.deadline is not None:
+                call.deadline = None if deadline is None else max(call.deadline, deadline)
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # a caller arriving while the task winds down must start a fresh call, not join a cancelled one
+                self._forget(key, call)
+                call.task.cancel()
+                await asyncio.wait([call.task], timeout=self.cancel_wait)
+
+    def deadline(self, key: str) -> float | None:
+        """Returns the deadline of the call in flight for `key`, None if it has none."""
+        call = self._calls.get(key)
+        return call.deadline if call is not None else None
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> SingleflightStats:
+        return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._calls)}
@@ -0,0 +1,57 @@
+"""
+SQLite files shared by the processes of one host.
+
+SQLiteCache, SQLiteWindowStore and SQLiteWatermarkStore keep their state in SQLite files
+that several processes, forked workers included, read and write at once. They open the
+file through an SQLiteDatabase, which runs it in WAL mode, waits for the write lock of
+other processes instead of failing, and gives each process its own connection.
+
+Classes:
+    SQLiteDatabase: Lazily opened, fork safe connection to one SQLite file
+"""
+
+
+import contextlib
+import os
+import sqlite3
+import threading
+from typing import Iterator
+
+
+class SQLiteDatabase:
+    """Lazily opened, fork safe connection to one SQLite file.
+
+    The connection is opened on first use, and again in a forked child, which must not use
+    the connection of its parent. It is shared by the threads of one process, one at a
+    time, so stores can run their queries with asyncio.to_thread.
+
+    Args:
+        path (str): Database file, created if missing.
+        schema (list[str]): Statements run on every new connection, e.g. CREATE TABLE IF NOT EXISTS.
+    """
+
+    def __init__(self, path: str, schema: list[str]):
+        self.path = os.path.expanduser(path)
+        self._schema = schema
+        self._conn: sqlite3.Connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Holds the connection of this process, opening it if needed, for the block."""
+        with self._lock:
+            if self._conn is None or self._pid != os.getpid():
+                conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                for statement in self._schema:
+                    conn.execute(statement)
+                self._conn = conn
+                self._pid = os.getpid()
+            yield self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -0,0 +1,232 @@
+"""
+Live tailing of the chain and of watched accounts.
+
+Endpoints such as /transaction/last and /block/last return a window of the newest items,
+and polling them in a tight loop mostly downloads items already seen. A Poller polls such
+an endpoint at an interval sized so that each window is about half new: first from the
+chain's throughput, measured with chain_info, then from the rate its polls observe.
+Items are deduplicated with a bounded SeenSet.
+
+Accounts are tailed by repeatedly running an incremental sync on each of them. A
+FairSchedule decides which account is polled next: every account is polled at least every
+`max_interval`, accounts with new activity are polled more often, and accounts due at the
+same time are served in turn, so no account can starve the others of the rate limit.
+
+Example:
+    async for tx in client.tail_transactions():
+        print(tx["tx_hash"])
+
+Classes:
+    SeenSet: Insertion-ordered set forgetting its oldest keys
+    Cadence: Chain throughput estimated from chain_info samples
+    Poller: Yields the new items of a latest-items endpoint
+    FairSchedule: Round-robin schedule of watched accounts with per-account intervals
+"""
+
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Iterable
+
+from loguru import logger
+
+
+class SeenSet:
+    """Set of at most `max_size` keys, forgetting the oldest first.
+
+    Args:
+        max_size (int): Keys remembered.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max(1, max_size)
+        self._keys: OrderedDict[Hashable, None] = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: Hashable) -> bool:
+        """Adds `key`. Returns whether it was new."""
+        if key in self._keys:
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
+        return True
+
+
+class Cadence:
+    """Chain throughput estimated from consecutive chain_info samples.
+
+    Until two samples are apart, Solana's nominal 400ms slots and a conservative
+    transaction rate are assumed.
+
+    Args:
+        max_age (float, optional): Seconds after which the estimate should be refreshed. Defaults to 60.
+    """
+
+    def __init__(self, *, max_age: float = 60):
+        self.max_age = max_age
+        self.slot_seconds = 0.4
+        self.tx_per_second = 1000.0
+        self._sample: tuple[float, int, int] | None = None
+        self._updated = 0.0
+        self._measured = False
+
+    def stale(self) -> bool:
+        age = time.monotonic() - self._updated
+        # a second sample is taken as soon as it is far enough from the first to measure anything
+        return age > self.max_age or (not self._measured and age >= 1)
+
+    def observe(self, info: dict[str, Any]):
+        """Feeds a chain_info result."""
+        now = time.monotonic()
+        slot, txs = info.get("absoluteSlot"), info.get("transactionCount")
+        if slot is None or txs is None:
+            return
+        if self._sample is not None:
+            at, last_slot, last_txs = self._sample
+            if now - at >= 1 and slot > last_slot:
+                self.slot_seconds = (now - at) / (slot - last_slot)
+                self._measured = True
+                if txs > last_txs:
+                    self.tx_per_second = (txs - last_txs) / (now - at)
+        self._sample = (now, slot, txs)
+        self._updated = now
+
+
+class Poller:
+    """Yields the items of a latest-items endpoint that were not seen before, oldest first.
+
+    The first poll only fills the seen set, so the stream starts with what is new after
+    it. The interval aims for `fill` of each window being new. It is first sized from
+    `rate`, the expected new items per second, and then from the rate the polls actually
+    observe, averaged over the last polls. A window with nothing seen before means items
+    may have been missed: it is counted in `gaps` and at least doubles the observed rate.
+
+    Args:
+        fetch (Callable[[], Awaitable[list]]): Returns the newest items, newest first.
+        key (Callable[[Any], Hashable]): Identity of an item.
+        rate (Callable[[], float]): Expected new items per second before any poll measured it.
+        limit (int): Items returned by one fetch.
+        refresh (Callable[[], Awaitable[None]], optional): Awaited before each poll, e.g. to refresh the rate. Defaults to None.
+        fill (float, optional): Target share of new items per window. Defaults to 0.5.
+        min_interval (float, optional): Shortest interval in seconds. Defaults to 0.5.
+        max_interval (float, optional): Longest interval in seconds. Defaults to 30.
+        seen_size (int, optional): Item keys remembered for deduplication. Defaults to 100000.
+    """
+
+    def __init__(self, fetch: Callable[[], Awaitable[list]], key: Callable[[Any], Hashable], rate: Callable[[], float], limit: int, *,
+                 refresh: Callable[[], Awaitable[None]] = None, fill: float = 0.5, min_interval: float = 0.5, max_interval: float = 30,
+                 seen_size: int = 100_000):
+        self._fetch = fetch
+        self._key = key
+        self._rate = rate
+        self._limit = limit
+        self._refresh = refresh
+        self._fill = fill
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.seen = SeenSet(seen_size)
+        self.observed: float | None = None
+        self.polls = 0
+        self.gaps = 0
+
+    def interval(self) -> float:
+        rate = self.observed if self.observed is not None else self._rate()
+        target = self._fill * self._limit / max(rate, 1e-9)
+        return min(self.max_interval, max(self.min_interval, target))
+
+    def _observe(self, new: int, total: int, elapsed: float):
+        rate = new / max(elapsed, 1e-9)
+        if total and new == total:
+            self.gaps += 1
+            rate = max(rate, 2 * (self.observed or 0))
+            self.observed = rate
+            logger.warning(f"Tail poll returned {total} items, none seen before, some may have been missed")
+            return
+        self.observed = rate if self.observed is None else 0.7 * self.observed + 0.3 * rate
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        last = None
+        while True:
+            if self._refresh:
+                await self._refresh()
+            started = time.monotonic()
+            items = await self._fetch()
+            new = [item for item in reversed(items) if self.seen.add(self._key(item))]
+            self.polls += 1
+            if last is not None:
+                self._observe(len(new), len(items), started - last)
+                for item in new:
+                    yield item
+            last = started
+            await asyncio.sleep(max(0.0, self.interval() - (time.monotonic() - started)))
+
+
+class FairSchedule:
+    """Schedule of watched accounts, each with its own polling interval.
+
+    An account starts at `min_interval`. Its interval doubles after every poll without new
+    activity, up to `max_interval`, and drops back to `min_interval` when activity shows up.
+    Accounts are handed out by due time, ties in the order they became due.
+
+    Args:
+        addresses (Iterable[str]): Accounts to watch.
+        min_interval (float, optional): Interval of active accounts, in seconds. Defaults to 1.
+        max_interval (float, optional): Interval of idle accounts, in seconds. Defaults to 60.
+    """
+
+    def __init__(self, addresses: Iterable[str], *, min_interval: float = 1, max_interval: float = 60):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._order = itertools.count()
+        self._intervals: dict[str, float] = {}
+        self._due: list[tuple[float, int, str]] = []
+        self._changed = asyncio.Event()
+        for address in addresses:
+            self.add(address)
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def add(self, address: str):
+        """Starts watching `address`, which is due right away."""
+        if address in self._intervals:
+            return
+        self._intervals[address] = self.min_interval
+        heapq.heappush(self._due, (time.monotonic(), next(self._order), address))
+        self._changed.set()
+
+    def remove(self, address: str):
+        """Stops watching `address`. A poll already handed out still finishes."""
+        self._intervals.pop(address, None)
+
+    async def next(self) -> str:
+        """Waits for the next due account and hands it out."""
+        while True:
+            while self._due and self._due[0][2] not in self._intervals:
+                heapq.heappop(self._due)
+            self._changed.clear()
+            wait = self._due[0][0] - time.monotonic() if self._due else None
+            if wait is not None and wait <= 0:
+                return heapq.heappop(self._due)[2]
+            try:
+                await asyncio.wait_for(self._changed.wait(), wait)
+            except TimeoutError:
+                pass
+
+    def done(self, address: str, active: bool):
+        """Reschedules `address` after a poll, sooner if it had new activity."""
+        if address not in self._intervals:
+            return
+        interval = self.min_interval if active else min(self.max_interval, self._intervals[address] * 2)
+        self._intervals[address] = interval
+        heapq.heappush(self._due, (time.monotonic() + interval, next(self._order), address))
+        self._changed.set()
@@ -0,0 +1,154 @@
+"""
+HTTP transports used by the Solscan client.
+
+A transport owns the connections behind Client.get. The default HttpxTransport is a
+native asyncio client that keeps one keep-alive connection pool per base URL and speaks
+HTTP/2 when the optional `h2` package is installed. RequestsTransport keeps the old
+thread-based `requests` path available as a fallback.
+
+Both bound the time to connect and the time between bytes read, so a hung connection
+fails instead of holding a pool slot, or a worker thread, forever.
+
+Example:
+    async with Client(auth_token="...", transport=RequestsTransport(pool_size=32)) as client:
+        tx = await client.tx_detail("...")
+"""
+
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import h2  # noqa: F401
+    http2_available = True
+except ImportError:
+    http2_available = False
+
+
+default_pool_size = 100
+default_connect_timeout = 10
+default_read_timeout = 30
+
+
+class Response:
+    """Transport independent view of an HTTP response."""
+
+    def __init__(self, status_code: int, content: bytes, headers: dict[str, str]):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {k.lower(): v for k, v in headers.items()}
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class Transport:
+    """Base class for transports.
+
+    Subclasses implement `get` and release their connections in `aclose`.
+    """
+
+    async def get(self, url: str, headers: dict[str, str]) -> Response:
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class HttpxTransport(Transport):
+    """Native asyncio transport backed by httpx.
+
+    Args:
+        pool_size (int, optional): Maximum connections kept per base URL. Defaults to 100.
+        http2 (bool, optional): Whether to negotiate HTTP/2. Defaults to True when `h2` is installed.
+        connect_timeout (float, optional): Seconds to establish a connection. Defaults to 10.
+        read_timeout (float, optional): Seconds to wait for each chunk of a response, and to send the request. Defaults to 30.
+    """
+
+    def __init__(self, *, pool_size: int = default_pool_size, http2: bool = http2_available,
+                 connect_timeout: float = default_connect_timeout, read_timeout: float = default_read_timeout):
+        if http2 and not http2_available:
+            raise Exception("HTTP/2 requires the h2 package, install it with: pip install httpx[http2]")
+        self._pool_size = pool_size
+        self._http2 = http2
+        # waiting for a free pooled connection is bounded by the caller's deadline, not here
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout, pool=None)
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _client(self, url: str) -> httpx.AsyncClient:
+        origin = _origin(url)
+        client = self._clients.get(origin)
+        if client is None:
+            limits = httpx.Limits(max_connections=self._pool_size, max_keepalive_connections=self._pool_size)
+            client = httpx.AsyncClient(base_url=origin, http2=self._http2, limits=limits, timeout=self._timeout)
+            self._clients[origin] = client
+        return client
+
+    async def get(self, url: str, headers: dict[str, str]) -> Response:
+        resp = await self._client(url).get(url, headers=headers)
+        return Response(resp.status_code, resp.content, resp.headers)
+
+    async def aclose(self):
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+class RequestsTransport(Transport):
+    """Thread-based transport backed by `requests`.
+
+    Each base URL gets its own Session so connections are reused, and calls run on a
+    dedicated thread pool sized to the connection pool.
+
+    Args:
+        pool_size (int, optional): Maximum connections and worker threads per base URL. Defaults to 100.
+        connect_timeout (float, optional): Seconds to establish a connection. Defaults to 10.
+        read_timeout (float, optional): Seconds to wait for each chunk of a response. Defaults to 30.
+    """
+
+    def __init__(self, *, pool_size: int = default_pool_size,
+                 connect_timeout: float = default_connect_timeout, read_timeout: float = default_read_timeout):
+        self._pool_size = pool_size
+        self._timeout = (connect_timeout, read_timeout)
+        self._sessions: dict[str, requests.Session] = {}
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="py3s")
+
+    def _session(self, url: str) -> requests.Session:
+        origin = _origin(url)
+        session = self._sessions.get(origin)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_size)
+            session.mount(origin, adapter)
+            self._sessions[origin] = session
+        return session
+
+    async def get(self, url: str, headers: dict[str, str]) -> Response:
+        session = self._session(url)
+        loop = asyncio.get_running_loop()
+        resp = await loop.run_in_executor(self._executor, lambda: session.get(url, headers=headers, timeout=self._timeout))
+        return Response(resp.status_code, resp.content, resp.headers)
+
+    async def aclose(self):
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            session.close()
+        self._executor.shutdown(wait=False)
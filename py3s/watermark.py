@@ -0,0 +1,97 @@
+"""
+High-water marks of incremental syncs.
+
+Client.sync_get remembers, per endpoint and arguments, the newest `block_time` it has
+returned and the `trans_id`s seen at that block time. The next sync asks only for rows at
+or after that block time and drops the ones already seen, so an address that had no new
+activity costs one request.
+
+Example:
+    client = Client(auth_token="...", watermark_store=SQLiteWatermarkStore("watermarks.sqlite"))
+    new_transfers = await client.sync_account_transfers(address)
+
+Classes:
+    WatermarkStore: Base class for watermark stores
+    MemoryWatermarkStore: Watermarks kept for the life of the process
+    SQLiteWatermarkStore: Watermarks kept in a SQLite file, shared by processes on one host
+"""
+
+
+import asyncio
+import json
+from typing import List, TypedDict
+
+from .sqlitedb import SQLiteDatabase
+
+
+Watermark = TypedDict("Watermark", {
+    "block_time": int,
+    "trans_ids": List[str]
+})
+
+
+class WatermarkStore:
+    """Base class for watermark stores.
+
+    Methods are awaited on the event loop, so stores doing I/O must not block it.
+    """
+
+    async def get(self, key: str) -> Watermark | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, watermark: Watermark):
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        """Forgets the watermark of `key`, so its next sync starts over."""
+        raise NotImplementedError
+
+
+class MemoryWatermarkStore(WatermarkStore):
+    def __init__(self):
+        self._marks: dict[str, Watermark] = {}
+
+    async def get(self, key: str) -> Watermark | None:
+        return self._marks.get(key)
+
+    async def set(self, key: str, watermark: Watermark):
+        self._marks[key] = watermark
+
+    async def delete(self, key: str):
+        self._marks.pop(key, None)
+
+
+class SQLiteWatermarkStore(WatermarkStore):
+    """Watermarks in one SQLite file, so syncs continue across restarts.
+
+    Queries run in a worker thread, so waiting for the write lock of another process does
+    not block the event loop.
+
+    Args:
+        path (str): Database file, created if missing.
+    """
+
+    def __init__(self, path: str):
+        self._db = SQLiteDatabase(path, [
+            "CREATE TABLE IF NOT EXISTS watermarks (key TEXT PRIMARY KEY, block_time INTEGER NOT NULL, trans_ids TEXT NOT NULL)",
+        ])
+
+    def _execute(self, sql: str, params: tuple) -> tuple | None:
+        with self._db.connection() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    async def get(self, key: str) -> Watermark | None:
+        row = await asyncio.to_thread(self._execute, "SELECT block_time, trans_ids FROM watermarks WHERE key = ?", (key,))
+        if row is None:
+            return None
+        return {"block_time": row[0], "trans_ids": json.loads(row[1])}
+
+    async def set(self, key: str, watermark: Watermark):
+        await asyncio.to_thread(self._execute, "INSERT OR REPLACE INTO watermarks (key, block_time, trans_ids) VALUES (?, ?, ?)",
+                                (key, watermark["block_time"], json.dumps(watermark["trans_ids"])))
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._execute, "DELETE FROM watermarks WHERE key = ?", (key,))
+
+    def close(self):
+        self._db.close()
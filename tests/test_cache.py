@@ -0,0 +1,23 @@
+import asyncio
+import math
+
+from py3s.cache import MemoryCache, SQLiteCache, TieredCache
+from py3s.columnar import TransferBatch
+
+
+def _transfers(n):
+    return [{"block_id": i, "trans_id": f"tx{i}", "block_time": 1_700_000_000 - i, "activity_type": "ACTIVITY_SPL_TRANSFER",
+             "from_address": "From", "to_address": "To", "token_address": "Token", "token_decimals": 6, "amount": i, "flow": "in"}
+            for i in range(n)]
+
+
+def test_tiered_cache_keeps_transformed_batches_on_disk(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    # a DecodePool transform such as TransferBatch turns a page into a ColumnBatch
+    batch = TransferBatch(_transfers(3))
+    asyncio.run(TieredCache(MemoryCache(), SQLiteCache(path), min_disk_ttl=0).set("page", batch, math.inf))
+
+    hit, value = asyncio.run(TieredCache(MemoryCache(), SQLiteCache(path), min_disk_ttl=0).get("page"))
+    assert hit
+    assert isinstance(value, TransferBatch)
+    assert list(value) == list(batch)
@@ -0,0 +1,15 @@
+from py3s.checkpoint import Checkpoint
+
+
+def test_pinned_value_survives_a_restart(tmp_path):
+    path = str(tmp_path / "crawl.jsonl")
+    first = Checkpoint(path, {"tasker": "account_transfers"})
+    assert first.pin("block_time_range", [0, 100]) == [0, 100]
+    first.put([0, 100], [{"trans_id": "tx0"}])
+    first.close()
+
+    resumed = Checkpoint(path, {"tasker": "account_transfers"})
+    # a resume resolving "now" later must keep the range of the first run
+    assert resumed.pin("block_time_range", [0, 200]) == [0, 100]
+    assert resumed.get([0, 100]) == (True, [{"trans_id": "tx0"}])
+    assert len(resumed) == 1
@@ -0,0 +1,108 @@
+import asyncio
+
+from py3s.singleflight import Singleflight
+
+
+def test_caller_after_abandoned_call_starts_fresh_call():
+    async def scenario():
+        flight = Singleflight()
+        started = asyncio.Event()
+        calls = []
+
+        async def slow():
+            calls.append("slow")
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                # the abandoned call takes a while to wind down, like a request closing its connection
+                await asyncio.sleep(0.05)
+                raise
+
+        async def fast():
+            calls.append("fast")
+            return "fresh"
+
+        first = asyncio.create_task(flight.do("key", slow))
+        await started.wait()
+        first.cancel()
+        await asyncio.sleep(0)
+        result = await asyncio.wait_for(flight.do("key", fast), 1)
+        return result, calls, flight.stats()
+
+    result, calls, stats = asyncio.run(scenario())
+    assert result == "fresh"
+    assert calls == ["slow", "fast"]
+    assert stats["shared"] == 0
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flight = Singleflight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "data"
+
+        results = await asyncio.gather(*(flight.do("key", fn) for _ in range(5)))
+        return results, calls
+
+    results, calls = asyncio.run(scenario())
+    assert results == ["data"] * 5
+    assert len(calls) == 1
+
+
+def test_last_caller_waits_for_cancelled_call_to_wind_down():
+    async def scenario():
+        flight = Singleflight()
+        started = asyncio.Event()
+        released = []
+
+        async def slow():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            finally:
+                # the abandoned call takes a while to wind down, like a request closing its connection
+                await asyncio.sleep(0.05)
+                released.append(True)
+
+        caller = asyncio.create_task(flight.do("key", slow))
+        await started.wait()
+        caller.cancel()
+        try:
+            await caller
+        except asyncio.CancelledError:
+            pass
+        return released
+
+    assert asyncio.run(scenario()) == [True]
+
+
+def test_shared_call_takes_the_latest_deadline_of_its_callers():
+    async def scenario():
+        flight = Singleflight()
+        seen = []
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            seen.append(flight.deadline("key"))
+            return "data"
+
+        first = asyncio.create_task(flight.do("key", fn, deadline=10.0))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("key", fn, deadline=20.0))
+        await asyncio.gather(first, second)
+        extended = seen[0]
+
+        seen.clear()
+        first = asyncio.create_task(flight.do("key", fn, deadline=10.0))
+        await asyncio.sleep(0)
+        # a caller without a deadline lifts it altogether
+        second = asyncio.create_task(flight.do("key", fn))
+        await asyncio.gather(first, second)
+        return extended, seen[0]
+
+    assert asyncio.run(scenario()) == (20.0, None)